@@ -0,0 +1,95 @@
+"""
+Shared AWS client registry
+Each boto3 client is built once per process with a tuned botocore Config,
+so requests reuse its keep-alive connection pool instead of paying for
+client construction and fresh TLS handshakes.
+"""
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Tuple[str, Optional[float], Optional[int]], object] = {}
+_session = None
+_lock = threading.Lock()
+
+
+def _client_config(
+    service_name: str,
+    read_timeout: Optional[float] = None,
+    max_attempts: Optional[int] = None
+) -> Config:
+    """botocore Config shared by all clients; model calls get a longer read timeout"""
+    if read_timeout is None:
+        read_timeout = (
+            settings.BEDROCK_READ_TIMEOUT_SECONDS
+            if service_name == "bedrock-runtime"
+            else settings.AWS_READ_TIMEOUT_SECONDS
+        )
+    return Config(
+        region_name=settings.AWS_REGION,
+        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=read_timeout,
+        retries={"mode": "adaptive", "total_max_attempts": max_attempts or settings.AWS_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+    )
+
+
+def get_session() -> boto3.session.Session:
+    """Process-wide boto3 session shared by all clients"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = boto3.session.Session(
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION,
+            )
+        return _session
+
+
+def get_client(
+    service_name: str,
+    read_timeout: Optional[float] = None,
+    max_attempts: Optional[int] = None
+):
+    """
+    Get the process-wide client for an AWS service, creating it on first use.
+
+    boto3 clients are thread-safe, so one instance serves every request.
+    Each distinct timeout/retry override gets its own shared client.
+
+    Args:
+        service_name: boto3 service name, e.g. 's3' or 'bedrock-runtime'
+        read_timeout: Override the default read timeout (seconds)
+        max_attempts: Override AWS_MAX_ATTEMPTS (including the first attempt)
+
+    Returns:
+        boto3 client
+    """
+    key = (service_name, read_timeout, max_attempts)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    session = get_session()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # boto3 sessions are not thread-safe; build clients under the lock
+            client = session.client(
+                service_name, config=_client_config(service_name, read_timeout, max_attempts)
+            )
+            _clients[key] = client
+            logger.info(
+                f"Created shared {service_name} client "
+                f"(pool={settings.AWS_MAX_POOL_CONNECTIONS}, retries=adaptive)"
+            )
+    return client
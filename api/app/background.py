@@ -0,0 +1,78 @@
+"""
+Background task helpers
+Periodic jobs started and stopped from the application lifespan
+"""
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Run a callable every `interval` seconds.
+
+    Blocking callables run in the threadpool so database or network work
+    never blocks the event loop; coroutine functions are awaited on the
+    loop. Failures are logged and the loop keeps going.
+
+    Stopping interrupts the wait between runs, never a run itself: a run in
+    progress finishes before `stop` returns, so callers can rely on its
+    effects (e.g. a flush re-buffering failed writes) being complete.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], object]):
+        """
+        Args:
+            name: Task name used in logs
+            interval: Seconds to wait between runs
+            func: Blocking callable or coroutine function to run
+        """
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Schedule the task on the running event loop"""
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(self._stopping), name=self.name)
+        logger.info(f"Started periodic task '{self.name}' (every {self.interval}s)")
+
+    async def stop(self):
+        """Stop scheduling runs and wait for one in progress to finish"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stopping = None
+        logger.info(f"Stopped periodic task '{self.name}'")
+
+    async def _run(self, stopping: asyncio.Event):
+        while True:
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                if asyncio.iscoroutinefunction(self.func):
+                    await self.func()
+                else:
+                    await run_in_threadpool(self.func)
+            except Exception as e:
+                logger.error(f"Periodic task '{self.name}' failed: {e}", exc_info=True)
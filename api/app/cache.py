@@ -0,0 +1,404 @@
+"""
+Response cache for hot read endpoints
+Stores fully serialized response bodies so cache hits skip the ORM and Pydantic.
+Bodies are compressed once when cached (gzip, plus brotli when the `brotli`
+package is installed) and hits serve the variant the client accepts.
+
+Backends:
+- LRUCacheBackend: in-process LRU with per-entry TTL (default). Entries and
+  invalidations are per process: with several workers, a write only clears
+  the cache of the worker that handled it, and the others serve stale pages
+  until the TTL expires.
+- RedisCacheBackend: shared across workers, enabled with RESPONSE_CACHE_URL
+
+Async route handlers use the `*_async` methods, which run network backends
+in the threadpool so a slow cache never blocks the event loop.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .etag import ETAG_CACHE_CONTROL, body_etag
+
+try:
+    import brotli
+except ImportError:  # Optional: entries are stored with gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Smaller bodies are stored uncompressed (same threshold as GZipMiddleware)
+COMPRESS_MIN_SIZE = 1000
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # Past 5 brotli gets much slower for little gain on JSON
+
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def compress_body(body: bytes) -> Dict[str, bytes]:
+    """Pre-compressed variants of a body, keyed by content-coding"""
+    if len(body) < COMPRESS_MIN_SIZE:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    return variants
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """
+    Pick a content-coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value (None: identity only)
+        available: Codings the response exists in
+
+    Returns:
+        The best acceptable coding, or None for identity
+    """
+    if not accept_encoding or not available:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for coding in ENCODING_PREFERENCE:
+        if coding in available:
+            q = weights.get(coding, weights.get("*", 0.0))
+            if q > best_q:
+                best, best_q = coding, q
+    return best
+
+
+class CacheBackend(ABC):
+    """Minimal byte-oriented key/value interface used by ResponseCache"""
+
+    # Whether entries and counters are visible to every worker
+    shared = False
+    # Whether operations do network I/O (offloaded from the event loop)
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Read a counter that is never evicted (0 if unset)"""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment a counter and return the new value"""
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with per-entry TTL.
+
+    Counters live outside the LRU so invalidation generations are never
+    evicted along with regular entries. Both are private to this process.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and hit/miss counters"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by every worker. Requires the `redis` package."""
+
+    shared = True
+    blocking = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_URL is set but the 'redis' package is not installed") from e
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+
+@dataclass
+class CachedResponse:
+    """
+    A serialized response body, its pre-compressed variants, and the
+    headers that must be replayed with it.
+
+    Build new entries with `CachedResponse.build`, which compresses the body
+    and tags it with an ETag hashed from it.
+    """
+
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, headers: Optional[Dict[str, str]] = None) -> "CachedResponse":
+        headers = {**(headers or {}), "ETag": body_etag(body), "Cache-Control": ETAG_CACHE_CONTROL}
+        return cls(body=body, headers=headers, encodings=compress_body(body))
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Body and headers to send for a client's Accept-Encoding.
+
+        Compressed variants carry a weak ETag: a strong one must differ
+        per encoding, and If-None-Match compares weakly anyway.
+        """
+        headers = dict(self.headers)
+        if not self.encodings:
+            return self.body, headers
+        headers["Vary"] = "Accept-Encoding"
+        coding = negotiate_encoding(accept_encoding, self.encodings)
+        if coding is None:
+            return self.body, headers
+        headers["Content-Encoding"] = coding
+        if "ETag" in headers and not headers["ETag"].startswith("W/"):
+            headers["ETag"] = f"W/{headers['ETag']}"
+        return self.encodings[coding], headers
+
+    def to_bytes(self) -> bytes:
+        meta = {
+            "headers": self.headers,
+            "sizes": [len(self.body), *(len(variant) for variant in self.encodings.values())],
+            "encodings": list(self.encodings),
+        }
+        parts = [json.dumps(meta, separators=(",", ":")).encode("utf-8"), self.body, *self.encodings.values()]
+        return parts[0] + b"\n" + b"".join(parts[1:])
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        meta_line, _, payload = raw.partition(b"\n")
+        meta = json.loads(meta_line)
+        chunks = []
+        offset = 0
+        for size in meta["sizes"]:
+            chunks.append(payload[offset:offset + size])
+            offset += size
+        return cls(body=chunks[0], headers=meta["headers"], encodings=dict(zip(meta["encodings"], chunks[1:])))
+
+
+class ResponseCache:
+    """
+    Cache of serialized listing responses with write-through invalidation.
+
+    Detail entries are keyed by listing ID and deleted when that listing
+    changes. List entries are keyed by normalized query parameters plus a
+    generation number; bumping the generation invalidates every cached list
+    page at once without scanning keys.
+
+    Every invalidation also opens a `lag_window` during which responses
+    read from a replica must not be cached: the replica may not have the
+    write yet, and caching it would serve stale data for the whole TTL.
+    """
+
+    LIST_GENERATION_KEY = "listings:generation"
+    RECENT_WRITE_KEY = "listings:recent-write"
+
+    def __init__(self, backend: CacheBackend, ttl: float, lag_window: float = 0.0, prefix: str = "cb"):
+        self.backend = backend
+        self.ttl = ttl
+        self.lag_window = lag_window
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def list_key(self, params: Dict[str, object]) -> str:
+        """Cache key for a list query. `params` should already be normalized."""
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+        try:
+            generation = self.backend.get_counter(self._key(self.LIST_GENERATION_KEY))
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            generation = 0
+        return f"listings:{generation}:{digest}"
+
+    def detail_key(self, listing_id: str) -> str:
+        """Cache key for a single listing"""
+        return f"listing:{listing_id}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = self.backend.get(self._key(key))
+        except Exception as e:
+            # A cache outage degrades to uncached reads
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return CachedResponse.from_bytes(raw)
+        except (ValueError, KeyError) as e:
+            # Entry written in an older format; treat as a miss and overwrite
+            logger.warning(f"Response cache entry unreadable: {e}")
+            return None
+
+    def set(self, key: str, response: CachedResponse):
+        try:
+            self.backend.set(self._key(key), response.to_bytes(), self.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def invalidate_lists(self):
+        """
+        Drop every cached list page.
+
+        With the in-process LRU backend this only affects the current
+        worker; other workers keep their pages until the TTL expires.
+        Configure RESPONSE_CACHE_URL to invalidate across workers.
+        """
+        try:
+            self.backend.incr(self._key(self.LIST_GENERATION_KEY))
+            if self.lag_window > 0:
+                self.backend.set(self._key(self.RECENT_WRITE_KEY), b"1", self.lag_window)
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {e}")
+
+    def invalidate_listing(self, listing_id: str):
+        """Drop a listing's detail entry and every list page it may appear on"""
+        try:
+            self.backend.delete(self._key(self.detail_key(listing_id)))
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed: {e}")
+        self.invalidate_lists()
+
+    def within_lag_window(self) -> bool:
+        """Whether a write was invalidated recently enough that replicas may lag it"""
+        if self.lag_window <= 0:
+            return False
+        try:
+            return self.backend.get(self._key(self.RECENT_WRITE_KEY)) is not None
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return True  # Unknown: don't cache replica reads
+
+    async def _offload(self, func: Callable[..., T], *args) -> T:
+        if self.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    async def list_key_async(self, params: Dict[str, object]) -> str:
+        return await self._offload(self.list_key, params)
+
+    async def get_async(self, key: str) -> Optional[CachedResponse]:
+        return await self._offload(self.get, key)
+
+    async def set_async(self, key: str, response: CachedResponse):
+        await self._offload(self.set, key, response)
+
+    async def within_lag_window_async(self) -> bool:
+        return await self._offload(self.within_lag_window)
+
+    async def invalidate_lists_async(self):
+        await self._offload(self.invalidate_lists)
+
+    async def invalidate_listing_async(self, listing_id: str):
+        await self._offload(self.invalidate_listing, listing_id)
+
+
+def create_backend(url: Optional[str], max_entries: int) -> CacheBackend:
+    """Build the configured cache backend: Redis when a URL is given, else in-process LRU"""
+    if url:
+        logger.info("Response cache backend: redis")
+        return RedisCacheBackend(url)
+    return LRUCacheBackend(max_entries=max_entries)
+
+
+# Process-wide response cache for listing endpoints
+response_cache = ResponseCache(
+    create_backend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_MAX_ENTRIES),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    # Replicas are assumed caught up once the read-your-writes window passes
+    lag_window=settings.DATABASE_REPLICA_STICKY_SECONDS if settings.DATABASE_REPLICA_URLS else 0.0,
+)
@@ -0,0 +1,25 @@
+"""
+Listing card projection
+Columns selected for compact ListingCard rows (browse grids, trending feed):
+no full description, image list or ORM identity map.
+"""
+from sqlalchemy import func
+
+from .models import Listing
+from .schemas import CARD_SNIPPET_LENGTH
+
+CARD_COLUMNS = (
+    Listing.id,
+    Listing.title,
+    func.left(Listing.description, CARD_SNIPPET_LENGTH + 1).label("snippet"),
+    Listing.price,
+    Listing.currency,
+    Listing.category,
+    Listing.condition,
+    Listing.location,
+    Listing.seller_name,
+    Listing.images[1].label("image"),  # Postgres arrays are 1-based
+    Listing.image_variants[(0, "card")].label("image_card"),
+    Listing.views,
+    Listing.created_at,
+)
@@ -1,6 +1,6 @@
 """Application configuration using Pydantic Settings"""
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +8,13 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DATABASE_ASYNC_POOL_SIZE: int = 10  # asyncpg connections for request handlers
+    DATABASE_ASYNC_MAX_OVERFLOW: int = 10
+    DATABASE_REPLICA_URLS: List[str] = []  # JSON list of read replica URLs for GET routes
+    DATABASE_REPLICA_STICKY_SECONDS: float = 5.0  # Reads stay on the primary this long after a write
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30.0  # How long a failed replica is skipped
+    DATABASE_REPLICA_HEALTH_INTERVAL_SECONDS: float = 5.0  # Background replica probe (SELECT 1)
+    DATABASE_REPLICA_HEALTH_TIMEOUT_SECONDS: float = 2.0  # A slower probe marks the replica down
 
     # Security
     SECRET_KEY: str
@@ -19,6 +26,11 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str
     AWS_REGION: str = "us-east-1"
     S3_BUCKET: str
+    AWS_MAX_POOL_CONNECTIONS: int = 20  # Keep-alive connections per shared client
+    AWS_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    AWS_READ_TIMEOUT_SECONDS: float = 10.0
+    BEDROCK_READ_TIMEOUT_SECONDS: float = 30.0
+    AWS_MAX_ATTEMPTS: int = 4  # Including the first attempt
 
     # Deployment
     EC2_PUBLIC_IP: Optional[str] = None
@@ -29,6 +41,59 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "production"
 
+    # Logging
+    REQUEST_LOG_SAMPLE_RATE: float = 0.1  # Share of 2xx/3xx requests logged; errors are always logged
+    REQUEST_LOG_SLOW_MS: float = 1000.0  # Requests slower than this are always logged
+
+    # Rate limiting (per client IP, shared by all workers)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: Optional[str] = None  # e.g. "120/minute"; routes not listed below are unlimited if unset
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "/listings/generate-listing": "10/minute",  # Bedrock text-generation call per request
+        "/listings/moderate": "30/minute",
+    }
+    RATE_LIMIT_REDIS_URL: Optional[str] = None  # e.g. redis://redis:6379/1 to share across hosts
+    RATE_LIMIT_MMAP_PATH: str = "/tmp/cyberbazaar-ratelimit"  # Shared by workers on one host
+    RATE_LIMIT_MMAP_SLOTS: int = 65536  # 16 bytes each
+    TRUSTED_PROXY_COUNT: int = 1  # Proxies appending to X-Forwarded-For (nginx); 0 uses the socket peer
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Serve /metrics for Prometheus
+
+    # Profiling (requires pyinstrument)
+    PROFILING_TOKEN: Optional[str] = None  # Requests sending X-Profile-Token with this value are profiled
+    PROFILING_SAMPLE_RATE: float = 0.0  # Share of all requests profiled
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    PROFILING_OUTPUT_DIR: str = "/tmp/cyberbazaar-profiles"
+
+    # Performance
+    JSON_RESPONSE_BACKEND: str = "orjson"  # Default response class: "orjson" or "json" (stdlib)
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0  # Write-behind view counter flush period
+    TRENDING_REFRESH_SECONDS: float = 60.0  # Trending feed ranking refresh period
+    TRENDING_SYNC_SECONDS: float = 5.0  # How often workers check leadership and reload the shared ranking
+    TRENDING_LOCK_PATH: str = "/tmp/cyberbazaar-trending.lock"  # flock elects one refreshing worker per host
+    TRENDING_SNAPSHOT_PATH: str = "/tmp/cyberbazaar-trending.snapshot"  # Ranking published by the leader
+    TRENDING_FEED_SIZE: int = 500  # Listings kept in the trending ranking
+    TRENDING_GRAVITY: float = 1.5  # Time-decay exponent; higher favours newer listings
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_URL: Optional[str] = None  # e.g. redis://redis:6379/0 to share across workers
+    MODERATION_CACHE_SIZE: int = 2048
+    MODERATION_CACHE_TTL_SECONDS: float = 3600.0
+    MODERATION_BATCH_CONCURRENCY: int = 8
+    MODERATION_ASYNC_WORKERS: int = 4  # Dedicated threads for request-path moderation
+    MODERATION_TIMEOUT_SECONDS: float = 10.0  # Fail open if no verdict in time
+    MODERATION_QUEUE_ENABLED: bool = True  # Insert as PENDING_REVIEW and moderate in the background
+    MODERATION_WORKER_IN_PROCESS: bool = True  # Drain the queue from the API process
+    MODERATION_QUEUE_POLL_SECONDS: float = 1.0
+    MODERATION_QUEUE_BATCH_SIZE: int = 16
+    MODERATION_QUEUE_LEASE_SECONDS: float = 300.0  # Claimed jobs become claimable again after this
+    MODERATION_EXTRA_BANNED_TERMS: List[str] = []  # JSON list, added to the built-in banlist
+    MODERATION_ALLOWLIST_PATTERNS: List[str] = []  # JSON list of known-good seller template regexes
+    IMAGE_PIPELINE_ENABLED: bool = True  # Build resized WebP/AVIF variants of uploaded images
+    IMAGE_PIPELINE_WORKERS: int = 1  # Image worker processes (CPU-bound, keep <= cores)
+    IMAGE_VARIANT_FORMATS: List[str] = ["webp"]  # Add "avif" on hosts with CPU and memory to spare; skipped if Pillow lacks the codec
+
     @property
     def cors_origins_list(self) -> List[str]:
         """
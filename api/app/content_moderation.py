@@ -2,14 +2,311 @@
 Content Moderation Service using AWS Bedrock
 Filters harmful, offensive, or inappropriate content from user submissions
 """
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Dict, Optional
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 import boto3
 from botocore.exceptions import ClientError
 
+from .aws_clients import get_client
+from .cache import LRUCacheBackend
+from .config import settings
+from .metrics import MODERATION_CALL_DURATION, MODERATION_VERDICTS
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever the moderation prompt changes so cached verdicts are not reused
+PROMPT_VERSION = "1"
+
+# Bedrock error codes that mean "slow down" rather than "failed"
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+
+# Retry policy for throttled calls in moderate_batch
+BATCH_MAX_RETRIES = 6
+BATCH_BACKOFF_BASE_SECONDS = 0.5
+BATCH_BACKOFF_MAX_SECONDS = 20.0
+
+
+class BedrockThrottledError(Exception):
+    """Raised instead of failing open when a caller asked to handle throttling itself"""
+
+
+class ModerationBusyError(Exception):
+    """Raised by moderate_content_async when every async worker is already busy"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for calls to a throttled API.
+
+    Halves the number of allowed in-flight calls on every throttle and
+    grows it by one after a full window of successful calls, up to the
+    configured maximum. Used as a context manager around each call.
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.throttle_count = 0
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return False
+
+    def on_success(self):
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttle(self):
+        with self._cond:
+            self.throttle_count += 1
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
+
+# Terms that are rejected outright, without asking the model
+DEFAULT_BANNED_TERMS = (
+    "fullz",
+    "cvv dump",
+    "cvv dumps",
+    "carding",
+    "ssn for sale",
+    "stolen credit card",
+    "stolen credit cards",
+    "cloned card",
+    "cloned cards",
+    "counterfeit money",
+    "counterfeit bills",
+    "child porn",
+)
+
+
+def _luhn_valid(digits: str) -> bool:
+    """Luhn checksum, used to tell card numbers from other long digit runs"""
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = int(char)
+        if index % 2 == 1:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+# Characters either side of a PII-shaped match searched for context wording
+PII_CONTEXT_WINDOW = 40
+SSN_CONTEXT = re.compile(r"\b(?:ssns?|social\s+security|soc\.?\s*sec)\b", re.IGNORECASE)
+CARD_CONTEXT = re.compile(
+    r"\b(?:credit|debit|card\s*(?:number|no|num|#)|cc|ccn|cvv2?|cvc|exp(?:iry|iration)?|"
+    r"visa|mastercard|amex|american\s+express|discover|jcb|unionpay)\b",
+    re.IGNORECASE,
+)
+
+# Issuer prefixes (IIN ranges) and the lengths they issue
+CARD_ISSUERS = (
+    (((4, 4),), (13, 16, 19)),                                      # Visa
+    (((51, 55), (2221, 2720)), (16,)),                              # Mastercard
+    (((34, 34), (37, 37)), (15,)),                                  # American Express
+    (((6011, 6011), (644, 649), (65, 65)), (16, 17, 18, 19)),       # Discover
+    (((3528, 3589),), (16, 17, 18, 19)),                            # JCB
+    (((300, 305), (36, 36), (38, 39)), (14, 15, 16, 17, 18, 19)),   # Diners Club
+    (((62, 62),), (16, 17, 18, 19)),                                # UnionPay
+)
+
+
+def _has_context(match: re.Match, context: re.Pattern) -> bool:
+    start = max(0, match.start() - PII_CONTEXT_WINDOW)
+    return context.search(match.string, start, match.end() + PII_CONTEXT_WINDOW) is not None
+
+
+def _valid_issuer(digits: str) -> bool:
+    """Whether a number's prefix and length belong to a card issuer"""
+    for ranges, lengths in CARD_ISSUERS:
+        if len(digits) not in lengths:
+            continue
+        for low, high in ranges:
+            if low <= int(digits[:len(str(low))]) <= high:
+                return True
+    return False
+
+
+def _is_card_number(match: re.Match) -> bool:
+    """
+    IMEIs, serials and tracking numbers can also be Luhn-valid, so only
+    reject a number with a real issuer prefix and card wording nearby.
+    Other matches are left for the model to judge.
+    """
+    digits = re.sub(r"\D", "", match.group())
+    return (
+        13 <= len(digits) <= 19
+        and _luhn_valid(digits)
+        and _valid_issuer(digits)
+        and _has_context(match, CARD_CONTEXT)
+    )
+
+
+def _has_ssn_context(match: re.Match) -> bool:
+    """
+    Part numbers, phone fragments and dates also look like ddd-dd-dddd,
+    so only reject when SSN wording appears nearby. Bare matches are left
+    for the model to judge.
+    """
+    return _has_context(match, SSN_CONTEXT)
+
+
+# (reason, compiled pattern, optional validator for each re.Match)
+PII_PATTERNS = (
+    (
+        "Contains what appears to be a Social Security number",
+        re.compile(r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b"),
+        _has_ssn_context,
+    ),
+    (
+        "Contains what appears to be a payment card number",
+        re.compile(r"\b\d(?:[ -]?\d){12,18}\b"),
+        _is_card_number,
+    ),
+)
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton for matching many terms in one pass over the text.
+    Matches must start and end on word boundaries.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[str]] = [None]
+
+        for term in terms:
+            term = term.casefold()
+            if not term:
+                continue
+            state = 0
+            for char in term:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] = term
+
+        # Breadth-first pass to build failure links; depth-1 states fail to the root
+        self._dict_suffix: List[int] = [0] * len(self._goto)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                if state:
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(char, 0)
+                # Nearest proper suffix state that ends a term
+                link = self._fail[child]
+                self._dict_suffix[child] = link if self._output[link] else self._dict_suffix[link]
+
+    def find(self, text: str) -> Optional[str]:
+        """First term found in `text` on word boundaries, or None"""
+        text = text.casefold()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            candidate = state if self._output[state] else self._dict_suffix[state]
+            while candidate:
+                term = self._output[candidate]
+                start = end - len(term) + 1
+                if _word_boundary(text, start - 1) and _word_boundary(text, end + 1):
+                    return term
+                candidate = self._dict_suffix[candidate]
+        return None
+
+
+def _word_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class LocalRuleStage:
+    """
+    Cheap, deterministic checks that run before the model.
+
+    Order: PII patterns and the banlist reject; the allowlist of known-good
+    seller templates approves. Anything else is undecided and goes on to
+    the verdict cache and then Bedrock.
+    """
+
+    def __init__(
+        self,
+        banned_terms: Iterable[str] = DEFAULT_BANNED_TERMS,
+        allowlist_patterns: Iterable[str] = ()
+    ):
+        """
+        Args:
+            banned_terms: Phrases that reject a listing outright
+            allowlist_patterns: Regexes that must fully match "title\ndescription"
+                (whitespace-normalized, case-insensitive) to approve without the model
+        """
+        self.banlist = AhoCorasick(banned_terms)
+        self.allowlist = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in allowlist_patterns]
+
+    def evaluate(self, title: str, description: str) -> Tuple[Optional[str], Optional[Dict[str, any]]]:
+        """
+        Returns:
+            Tuple of (stage name, verdict), or (None, None) if no rule decided
+        """
+        text = f"{title}\n{description}"
+
+        for reason, pattern, validator in PII_PATTERNS:
+            for match in pattern.finditer(text):
+                if validator is None or validator(match):
+                    return "rule_pii", {"approved": False, "reason": reason, "confidence": "HIGH"}
+
+        term = self.banlist.find(text)
+        if term is not None:
+            return "rule_banlist", {
+                "approved": False,
+                "reason": f"Contains prohibited term: {term}",
+                "confidence": "HIGH"
+            }
+
+        if self.allowlist:
+            normalized = "\n".join([" ".join(title.split()), " ".join(description.split())])
+            if any(pattern.fullmatch(normalized) for pattern in self.allowlist):
+                return "rule_allowlist", {"approved": True, "reason": "Content approved", "confidence": "HIGH"}
+
+        return None, None
+
 
 class ContentModerationService:
     """
@@ -21,7 +318,14 @@ class ContentModerationService:
         self,
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
-        region_name: str = "us-east-1"
+        region_name: str = "us-east-1",
+        cache_size: int = 2048,
+        cache_ttl: float = 3600.0,
+        batch_concurrency: int = 8,
+        async_workers: int = 4,
+        rule_stage: Optional[LocalRuleStage] = None,
+        bedrock_client=None,
+        interactive_client=None
     ):
         """
         Initialize the content moderation service with AWS Bedrock client.
@@ -30,26 +334,57 @@ class ContentModerationService:
             aws_access_key_id: AWS access key (optional, uses env vars if not provided)
             aws_secret_access_key: AWS secret key (optional, uses env vars if not provided)
             region_name: AWS region for Bedrock service
+            cache_size: Maximum number of memoized verdicts
+            cache_ttl: Seconds a memoized verdict stays valid
+            batch_concurrency: Maximum parallel model calls in moderate_batch
+            async_workers: Threads dedicated to moderate_content_async calls
+            rule_stage: Local pre-filter run before the model (defaults to LocalRuleStage())
+            bedrock_client: Existing bedrock-runtime client to reuse (credentials are ignored if given)
+            interactive_client: bedrock-runtime client for moderate_content_async, with
+                timeouts that fit the request deadline (defaults to bedrock_client)
         """
+        # Local rules decide obvious cases without a model call
+        self.rule_stage = rule_stage or LocalRuleStage()
+        self._stage_counts: Counter = Counter()
+        self._stage_lock = threading.Lock()
+
+        # Verdicts memoized by content hash; repeat submissions skip the model
+        self.verdict_cache = LRUCacheBackend(max_entries=cache_size)
+        self.cache_ttl = cache_ttl
+        self.batch_concurrency = batch_concurrency
+
+        # Dedicated pool so slow model calls never occupy the request threadpool.
+        # Slots are held until the worker thread finishes (not until the caller
+        # stops waiting), so a slow Bedrock fills them and new work is refused
+        # instead of queueing without bound.
+        self._async_executor = ThreadPoolExecutor(
+            max_workers=async_workers,
+            thread_name_prefix="moderation-async"
+        )
+        self._async_slots = threading.BoundedSemaphore(async_workers)
+
         try:
-            self.bedrock_runtime = boto3.client(
+            self.bedrock_runtime = bedrock_client or boto3.client(
                 service_name='bedrock-runtime',
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
                 region_name=region_name
             )
             self.model_id = "us.amazon.nova-pro-v1:0"
+            self.interactive_runtime = interactive_client or self.bedrock_runtime
             logger.info(f"Initialized ContentModerationService with model: {self.model_id}")
         except Exception as e:
             logger.error(f"Failed to initialize AWS Bedrock client: {e}")
             raise
 
-    def _call_bedrock_model(self, prompt: str) -> str:
+    def _call_bedrock_model(self, prompt: str, raise_on_throttle: bool = False, client=None) -> str:
         """
         Make a call to AWS Bedrock Amazon Nova Pro model.
 
         Args:
             prompt: The prompt to send to the model
+            raise_on_throttle: Raise BedrockThrottledError on throttling instead of failing open
+            client: bedrock-runtime client to use (defaults to the batch client)
 
         Returns:
             Model response text
@@ -68,15 +403,27 @@ class ContentModerationService:
                 }
             }
 
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                response = (client or self.bedrock_runtime).invoke_model(
+                    modelId=self.model_id,
+                    body=json.dumps(request_body)
+                )
+                response_body = json.loads(response['body'].read())
+                outcome = "ok"
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES:
+                    outcome = "throttled"
+                raise
+            finally:
+                MODERATION_CALL_DURATION.labels(outcome).observe(time.perf_counter() - started)
 
-            response_body = json.loads(response['body'].read())
             return response_body['output']['message']['content'][0]['text']
 
         except ClientError as e:
+            if raise_on_throttle and e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES:
+                raise BedrockThrottledError(str(e)) from e
             logger.error(f"AWS Bedrock API error: {e}")
             # Fail open - if moderation service is down, allow content but log warning
             logger.warning("Content moderation unavailable, allowing content")
@@ -86,7 +433,62 @@ class ContentModerationService:
             # Fail open for better user experience
             return "APPROVED"
 
-    def moderate_content(self, title: str, description: str) -> Dict[str, any]:
+    def _verdict_cache_key(self, title: str, description: str) -> str:
+        """
+        Hash of the normalized content plus model and prompt version.
+
+        Normalization collapses whitespace and case so trivially different
+        resubmissions of the same text share a verdict.
+        """
+        normalized_title = " ".join(title.split()).casefold()
+        normalized_description = " ".join(description.split()).casefold()
+        material = "\x00".join(
+            [self.model_id, PROMPT_VERSION, normalized_title, normalized_description]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _cached_verdict(self, cache_key: str) -> Optional[Dict[str, any]]:
+        """Memoized verdict for a cache key, if any"""
+        cached = self.verdict_cache.get(cache_key)
+        return json.loads(cached) if cached is not None else None
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Verdict cache size and hit/miss counters"""
+        return self.verdict_cache.stats()
+
+    def _count_stage(self, stage: str, approved: bool):
+        with self._stage_lock:
+            self._stage_counts[stage] += 1
+        MODERATION_VERDICTS.labels(stage, "approved" if approved else "rejected").inc()
+
+    def stage_stats(self) -> Dict[str, int]:
+        """
+        How many verdicts each stage produced.
+        Stages: rule_pii, rule_banlist, rule_allowlist, cache, model.
+        """
+        with self._stage_lock:
+            return dict(self._stage_counts)
+
+    def _local_verdict(self, title: str, description: str, cache_key: str) -> Optional[Dict[str, any]]:
+        """Verdict from the rule stage or the verdict cache, without calling the model"""
+        stage, verdict = self.rule_stage.evaluate(title, description)
+        if verdict is None:
+            verdict = self._cached_verdict(cache_key)
+            stage = "cache" if verdict is not None else None
+
+        if verdict is not None:
+            self._count_stage(stage, verdict["approved"])
+            logger.debug(f"Content moderation verdict from {stage}")
+            if not verdict["approved"]:
+                logger.info(f"Content REJECTED by {stage}: {verdict['reason']}")
+        return verdict
+
+    def moderate_content(
+        self,
+        title: str,
+        description: str,
+        raise_on_throttle: bool = False
+    ) -> Dict[str, any]:
         """
         Moderate listing content for harmful or inappropriate material.
 
@@ -101,13 +503,35 @@ class ContentModerationService:
         Args:
             title: Listing title
             description: Listing description
+            raise_on_throttle: Raise BedrockThrottledError on throttling instead of failing open
 
         Returns:
             Dict with:
                 - approved: bool (True if content is safe)
                 - reason: str (explanation if rejected)
                 - confidence: str (HIGH, MEDIUM, LOW)
+
+        The local rule stage and the verdict cache are consulted first; only
+        undecided content reaches the model. Verdicts parsed from a model
+        response are memoized; fail-open results are never cached, so a
+        Bedrock outage does not pin approvals.
         """
+        cache_key = self._verdict_cache_key(title, description)
+        local = self._local_verdict(title, description, cache_key)
+        if local is not None:
+            return local
+
+        return self._moderate_with_model(title, description, cache_key, raise_on_throttle)
+
+    def _moderate_with_model(
+        self,
+        title: str,
+        description: str,
+        cache_key: str,
+        raise_on_throttle: bool = False,
+        client=None
+    ) -> Dict[str, any]:
+        """Ask Bedrock for a verdict and memoize it (skips the local stages)"""
         prompt = f"""You are a content moderation system for a cyberpunk-themed online marketplace called CyberBazaar (like Craigslist).
 
 Analyze the following listing submission for harmful, illegal, or inappropriate content.
@@ -138,7 +562,7 @@ Respond ONLY in this exact JSON format:
 }}"""
 
         try:
-            response_text = self._call_bedrock_model(prompt)
+            response_text = self._call_bedrock_model(prompt, raise_on_throttle=raise_on_throttle, client=client)
 
             # Parse JSON response
             # Handle cases where model adds markdown code blocks
@@ -160,11 +584,16 @@ Respond ONLY in this exact JSON format:
                 "confidence": confidence
             }
 
+            self._count_stage("model", result["approved"])
             if not result["approved"]:
                 logger.info(f"Content REJECTED: {reason} (confidence: {confidence})")
 
+            self.verdict_cache.set(cache_key, json.dumps(result).encode("utf-8"), self.cache_ttl)
+
             return result
 
+        except BedrockThrottledError:
+            raise
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse moderation response: {e}")
             logger.error(f"Raw response: {response_text}")
@@ -183,23 +612,113 @@ Respond ONLY in this exact JSON format:
                 "confidence": "LOW"
             }
 
-    def moderate_batch(self, listings: list) -> list:
+    async def moderate_content_async(
+        self,
+        title: str,
+        description: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, any]:
+        """
+        Moderate content without blocking the event loop.
+
+        Rule-stage and cached verdicts return immediately. Otherwise the model call runs on
+        the service's dedicated executor, leaving both the event loop and the
+        request threadpool free while Bedrock answers. The call uses the
+        interactive client, whose read timeout and retries fit the request
+        deadline, so a timed-out call frees its thread soon after.
+
+        Args:
+            title: Listing title
+            description: Listing description
+            timeout: Seconds to wait for a verdict before failing open (None waits indefinitely)
+
+        Returns:
+            Same dict as moderate_content
+
+        Raises:
+            ModerationBusyError: Every async worker is still busy with an earlier call
+        """
+        cache_key = self._verdict_cache_key(title, description)
+        local = self._local_verdict(title, description, cache_key)
+        if local is not None:
+            return local
+
+        if not self._async_slots.acquire(blocking=False):
+            raise ModerationBusyError("All moderation workers are busy")
+        future = self._async_executor.submit(
+            self._moderate_with_model, title, description, cache_key, False, self.interactive_runtime
+        )
+        future.add_done_callback(lambda _: self._async_slots.release())
+        call = asyncio.wrap_future(future)
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            # Fail open, matching the policy for other moderation failures
+            logger.warning(f"Content moderation timed out after {timeout}s, allowing content")
+            return {
+                "approved": True,
+                "reason": "Moderation timed out, content allowed",
+                "confidence": "LOW"
+            }
+
+    def shutdown(self):
+        """Release the async executor threads"""
+        self._async_executor.shutdown(wait=False, cancel_futures=True)
+
+    def moderate_batch(self, listings: list, max_concurrency: Optional[int] = None) -> list:
         """
         Moderate multiple listings in batch.
 
+        Calls fan out across a thread pool. An adaptive limiter shrinks the
+        number of in-flight calls when Bedrock throttles and grows it back
+        as calls succeed; throttled calls are retried with jittered
+        exponential backoff. Throughput is logged when the batch completes.
+
         Args:
             listings: List of dicts with 'title' and 'description' keys
+            max_concurrency: Upper bound on parallel model calls (defaults to batch_concurrency)
 
         Returns:
             List of moderation results in same order
         """
-        results = []
-        for listing in listings:
-            result = self.moderate_content(
-                title=listing.get("title", ""),
-                description=listing.get("description", "")
-            )
-            results.append(result)
+        if not listings:
+            return []
+
+        limiter = AdaptiveConcurrencyLimiter(max_concurrency or self.batch_concurrency)
+
+        def moderate_one(listing: dict) -> Dict[str, any]:
+            for attempt in range(BATCH_MAX_RETRIES + 1):
+                with limiter:
+                    try:
+                        result = self.moderate_content(
+                            title=listing.get("title", ""),
+                            description=listing.get("description", ""),
+                            raise_on_throttle=True
+                        )
+                        limiter.on_success()
+                        return result
+                    except BedrockThrottledError:
+                        limiter.on_throttle()
+                backoff = min(BATCH_BACKOFF_MAX_SECONDS, BATCH_BACKOFF_BASE_SECONDS * (2 ** attempt))
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+
+            logger.warning("Bedrock still throttling after retries, allowing content")
+            return {
+                "approved": True,
+                "reason": "Moderation service unavailable, content allowed",
+                "confidence": "LOW"
+            }
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=limiter.max_limit, thread_name_prefix="moderation") as executor:
+            results = list(executor.map(moderate_one, listings))
+        elapsed = time.perf_counter() - started
+
+        logger.info(
+            f"Moderated {len(results)} listings in {elapsed:.1f}s "
+            f"({len(results) / elapsed:.1f} listings/s, throttled {limiter.throttle_count}x, "
+            f"final concurrency {limiter.limit}/{limiter.max_limit})"
+        )
         return results
 
 
@@ -229,7 +748,28 @@ def get_moderation_service(
         _moderation_service = ContentModerationService(
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
+            region_name=region_name,
+            cache_size=settings.MODERATION_CACHE_SIZE,
+            cache_ttl=settings.MODERATION_CACHE_TTL_SECONDS,
+            batch_concurrency=settings.MODERATION_BATCH_CONCURRENCY,
+            async_workers=settings.MODERATION_ASYNC_WORKERS,
+            rule_stage=LocalRuleStage(
+                banned_terms=[*DEFAULT_BANNED_TERMS, *settings.MODERATION_EXTRA_BANNED_TERMS],
+                allowlist_patterns=settings.MODERATION_ALLOWLIST_PATTERNS
+            ),
+            bedrock_client=get_client("bedrock-runtime"),
+            # One attempt that gives up with the request deadline
+            interactive_client=get_client(
+                "bedrock-runtime",
+                read_timeout=settings.MODERATION_TIMEOUT_SECONDS,
+                max_attempts=1
+            )
         )
 
     return _moderation_service
+
+
+def shutdown_moderation_service():
+    """Release the moderation service's executor threads, if it was created"""
+    if _moderation_service is not None:
+        _moderation_service.shutdown()
@@ -1,12 +1,29 @@
 """Database configuration and session management"""
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import math
+import time
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .background import PeriodicTask
 from .config import settings
+from .metrics import TimedAsyncQueuePool, TimedQueuePool, pool_collector
+
+logger = logging.getLogger(__name__)
 
-# Create SQLAlchemy engine
+# Create SQLAlchemy engine (sync): schema setup, background workers and scripts
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_logging_name="sync",
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
@@ -16,6 +33,129 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async driver for each backend we run against
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Same database, async driver: postgresql[+psycopg2]://... -> postgresql+asyncpg://..."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def create_request_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Async engine for request handlers, sized by the DATABASE_ASYNC_* settings.
+    `name` labels its pool in /metrics.
+    """
+    return create_async_engine(
+        async_database_url(url),
+        poolclass=TimedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_pre_ping=True,
+        pool_size=settings.DATABASE_ASYNC_POOL_SIZE,
+        max_overflow=settings.DATABASE_ASYNC_MAX_OVERFLOW,
+        pool_recycle=3600,
+    )
+
+
+# Async engine: request handlers. Connections are only held while a query
+# runs, so the pool (not the threadpool) bounds database concurrency.
+async_engine = create_request_engine(settings.DATABASE_URL, "primary")
+
+# expire_on_commit=False: responses are serialized after commit without reloading
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+class ReplicaSet:
+    """
+    Read replicas picked round-robin.
+
+    A background probe (SELECT 1 every DATABASE_REPLICA_HEALTH_INTERVAL_SECONDS)
+    takes dead replicas out of rotation before requests reach them and puts
+    them back once they answer again. A replica whose connection fails
+    during a request is also skipped for DATABASE_REPLICA_RETRY_SECONDS or
+    until the next successful probe. When none are available reads fall
+    back to the primary.
+    """
+
+    def __init__(self, urls: List[str], retry_after: float, health_interval: float, health_timeout: float):
+        self.engines = [create_request_engine(url, f"replica{index}") for index, url in enumerate(urls)]
+        self.retry_after = retry_after
+        self.health_timeout = health_timeout
+        self._down_until = [0.0] * len(self.engines)
+        self._counter = itertools.count()
+        self._health_task = PeriodicTask("replica-health", health_interval, self.check_health)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None to read from the primary"""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = next(self._counter) % len(self.engines)
+            if self._down_until[index] <= now:
+                return self.engines[index]
+        return None
+
+    def mark_down(self, replica: AsyncEngine, error: Exception):
+        """Take a replica out of rotation after a connection failure"""
+        index = self.engines.index(replica)
+        self._down_until[index] = time.monotonic() + self.retry_after
+        logger.warning(
+            f"Read replica {replica.url.host or replica.url.database} unavailable, "
+            f"skipping for {self.retry_after:.0f}s: {str(error) or type(error).__name__}"
+        )
+
+    async def _probe(self, replica: AsyncEngine):
+        async with replica.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check_health(self):
+        """Probe every replica concurrently, updating which are in rotation"""
+        results = await asyncio.gather(
+            *(asyncio.wait_for(self._probe(replica), self.health_timeout) for replica in self.engines),
+            return_exceptions=True,
+        )
+        for index, (replica, result) in enumerate(zip(self.engines, results)):
+            if isinstance(result, BaseException):
+                if self._down_until[index] <= time.monotonic():
+                    self.mark_down(replica, result)
+                else:
+                    # Still failing: keep it out until the next probe
+                    self._down_until[index] = time.monotonic() + self.retry_after
+            elif self._down_until[index]:
+                self._down_until[index] = 0.0
+                logger.info(f"Read replica {replica.url.host or replica.url.database} is back in rotation")
+
+    def start(self):
+        """Start background health probes (no-op without replicas)"""
+        if self.engines:
+            self._health_task.start()
+
+    async def dispose(self):
+        await self._health_task.stop()
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaSet(
+    settings.DATABASE_REPLICA_URLS,
+    retry_after=settings.DATABASE_REPLICA_RETRY_SECONDS,
+    health_interval=settings.DATABASE_REPLICA_HEALTH_INTERVAL_SECONDS,
+    health_timeout=settings.DATABASE_REPLICA_HEALTH_TIMEOUT_SECONDS,
+)
+
+# Pool gauges for /metrics (looked up per scrape: dispose() swaps in a new pool)
+pool_collector.register("sync", lambda: engine.pool)
+pool_collector.register("primary", lambda: async_engine.sync_engine.pool)
+for _index, _replica in enumerate(replicas.engines):
+    pool_collector.register(f"replica{_index}", lambda replica=_replica: replica.sync_engine.pool)
+
+# Set after a write so the client's next reads see it despite replication lag
+PRIMARY_STICKY_COOKIE = "cb_read_primary"
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -27,3 +167,63 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this client wrote recently and must read its own writes"""
+    return bool(request.cookies.get(PRIMARY_STICKY_COOKIE))
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """Whether a get_read_db session reads from a replica rather than the primary"""
+    return db.bind is not async_engine
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency for a read-only async session, routed to a replica.
+
+    Clients that wrote within the last DATABASE_REPLICA_STICKY_SECONDS
+    (see stick_to_primary) read from the primary instead. The replica
+    connection is checked out before the handler runs, so a replica that
+    cannot be reached is marked down and the request reads from the
+    primary rather than failing.
+    """
+    replica = None
+    if not reads_from_primary(request):
+        replica = replicas.choose()
+
+    if replica is not None:
+        async with AsyncSessionLocal(bind=replica) as db:
+            try:
+                await db.connection()
+            except (OperationalError, InterfaceError, OSError) as e:
+                replicas.mark_down(replica, e)
+            else:
+                try:
+                    yield db
+                except (OperationalError, InterfaceError, OSError) as e:
+                    replicas.mark_down(replica, e)
+                    raise
+                return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def stick_to_primary(response: Response):
+    """Route this client's reads to the primary for the sticky window"""
+    if replicas.engines:
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            "1",
+            max_age=math.ceil(settings.DATABASE_REPLICA_STICKY_SECONDS),
+            httponly=True,
+            samesite="lax",
+        )
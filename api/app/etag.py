@@ -0,0 +1,56 @@
+"""
+Conditional GET support
+Strong ETags for `If-None-Match` / 304 Not Modified: hashed from the
+serialized body for cached responses, or from the values a representation
+is derived from when those are already a content hash (the trending
+snapshot version).
+"""
+import hashlib
+from typing import Dict, Optional
+
+from fastapi.responses import Response
+
+# Stored by browsers and proxies but revalidated before every reuse
+ETAG_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Strong ETag for a representation.
+
+    Args:
+        parts: Every value the response body depends on
+
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a serialized response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`.
+
+    Uses weak comparison, as required for If-None-Match: nginx marks
+    ETags weak when it compresses a response, and clients echo them back.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Empty 304 response carrying the validator and caching headers"""
+    return Response(
+        status_code=304,
+        headers={**(headers or {}), "ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL},
+    )
@@ -0,0 +1,203 @@
+"""
+Image processing pipeline for uploaded listing photos
+Feeds approved listings' uploads to a small process pool that builds
+resized variants (see image_variants) and saves the result on the listing.
+
+Decoding and encoding are CPU-bound, so the work runs in a process pool
+instead of the request threadpool. Listings that predate the pipeline
+can be backfilled with: python -m app.image_pipeline
+
+Only approved listings are processed: create_listing submits ACTIVE
+listings, and the moderation queue submits listings once it approves them.
+"""
+import asyncio
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .cache import response_cache
+from .config import settings
+from .database import SessionLocal
+from .image_variants import available_formats, key_from_url, process_listing_images
+from .models import Listing, ListingStatus
+
+logger = logging.getLogger(__name__)
+
+
+def store_variants(listing_id: str, variants: List[Dict[str, object]]):
+    """Save a listing's processed variants and drop its cached responses"""
+    db = SessionLocal()
+    try:
+        updated = (
+            db.query(Listing)
+            .filter(Listing.id == listing_id)
+            .update({Listing.image_variants: variants}, synchronize_session=False)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    if updated:
+        response_cache.invalidate_listing(listing_id)
+
+
+class ImagePipeline:
+    """
+    Process pool that builds image variants for new listings.
+
+    Workers are started lazily with the "spawn" method, so they never
+    inherit the API's threads, sockets or connection pools, and only
+    import image_variants rather than the whole app.
+
+    Finished results are handed back to their owner before anything is
+    written: to the event loop captured by `start` (the API), or to a queue
+    emptied by `store_completed` (standalone workers without a loop). The
+    pool's callback thread never touches the database.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # submit() is called from the event loop and the moderation worker thread
+        self._executor_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._completed: "queue.SimpleQueue[Tuple[str, Future]]" = queue.SimpleQueue()
+
+    def start(self):
+        """Deliver results to the running event loop (call from the application lifespan)"""
+        self._loop = asyncio.get_running_loop()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, listing_id: str, image_urls: List[str]) -> Optional[Future]:
+        """
+        Queue variant generation for a listing's images.
+
+        Results are written back to the listing when processing finishes.
+        Returns None when the listing has no images to process.
+        """
+        if not any(key_from_url(url) for url in image_urls):
+            return None
+
+        future = self._get_executor().submit(process_listing_images, list(image_urls), available_formats())
+        future.add_done_callback(lambda done: self._on_done(listing_id, done))
+        return future
+
+    def _on_done(self, listing_id: str, future: Future):
+        # Runs in the pool's callback thread: only hand the result over
+        if future.cancelled():
+            return
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._schedule_store, listing_id, future)
+                return
+            except RuntimeError:
+                pass  # Loop already closed
+        self._completed.put((listing_id, future))
+
+    def _schedule_store(self, listing_id: str, future: Future):
+        task = asyncio.create_task(run_in_threadpool(self._store_result, listing_id, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _store_result(self, listing_id: str, future: Future):
+        """Write one finished job; failures leave image_variants NULL for the backfill"""
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Image pipeline failed for listing {listing_id}: {error}")
+            return
+        try:
+            store_variants(listing_id, future.result())
+            logger.info(f"Stored image variants for listing {listing_id}")
+        except Exception as e:
+            logger.error(f"Failed to store image variants for listing {listing_id}: {e}")
+
+    def store_completed(self) -> int:
+        """
+        Write results queued while no event loop was attached.
+
+        Returns:
+            Number of results handled
+        """
+        handled = 0
+        while True:
+            try:
+                listing_id, future = self._completed.get_nowait()
+            except queue.Empty:
+                return handled
+            self._store_result(listing_id, future)
+            handled += 1
+
+    async def shutdown(self):
+        """Finish in-flight work, write its results and stop the worker processes"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+        # Let hand-offs scheduled by the last callbacks create their tasks
+        await asyncio.sleep(0)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._loop = None
+        await run_in_threadpool(self.store_completed)
+
+
+# Process-wide pipeline, fed by create_listing and the moderation queue
+image_pipeline = ImagePipeline(max_workers=settings.IMAGE_PIPELINE_WORKERS)
+
+
+def queue_listing_images(listing_id: str, image_urls: List[str]):
+    """Submit an approved listing's images when the pipeline is enabled"""
+    if not settings.IMAGE_PIPELINE_ENABLED or not image_urls:
+        return
+    try:
+        image_pipeline.submit(listing_id, image_urls)
+    except Exception as e:
+        # Clients fall back to the original uploads
+        logger.error(f"Failed to queue image processing for listing {listing_id}: {e}")
+
+
+def backfill(batch_size: int = 50) -> int:
+    """Process approved listings (ACTIVE or SOLD) that have images but no variants yet"""
+    formats = available_formats()
+    processed = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = (
+                db.query(Listing.id, Listing.images)
+                .filter(
+                    Listing.image_variants.is_(None),
+                    Listing.images != [],
+                    Listing.status.in_([ListingStatus.ACTIVE, ListingStatus.SOLD]),
+                )
+                .order_by(Listing.created_at)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return processed
+            for listing_id, images in rows:
+                store_variants(listing_id, process_listing_images(images or [], formats))
+                processed += 1
+            logger.info(f"Backfilled image variants for {processed} listings")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    backfill()
@@ -0,0 +1,148 @@
+"""
+Image variant builder run inside the image pipeline's worker processes
+Turns each original upload into resized, EXIF-stripped WebP (and AVIF when
+enabled and supported) variants stored next to the original in S3.
+
+Pool workers are spawned fresh and import only this module, so it must stay
+free of the web app: no database engines, caches, metrics or routers.
+"""
+import logging
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+
+from .aws_clients import get_client
+from .config import settings
+
+try:
+    # Registers the AVIF codec on Pillow builds without native support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+# Bounding box (px) per variant; aspect ratio is preserved and images are never upscaled
+VARIANT_SIZES = {
+    "thumb": 160,
+    "card": 480,
+    "full": 1600,
+}
+
+ENCODERS = {
+    "webp": {"format": "WEBP", "content_type": "image/webp", "options": {"quality": 80, "method": 4}},
+    "avif": {"format": "AVIF", "content_type": "image/avif", "options": {"quality": 60, "speed": 8}},
+}
+
+# Variants are content-addressed by the upload's UUID and never rewritten
+VARIANT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Reject decompression bombs well before Pillow's default limit
+Image.MAX_IMAGE_PIXELS = 50_000_000
+
+
+def public_url(key: str) -> str:
+    """Public URL of an object in the uploads bucket"""
+    return f"https://{settings.S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+
+def key_from_url(url: str) -> Optional[str]:
+    """Object key for a URL in the uploads bucket, or None for external images"""
+    prefix = public_url("")
+    if not url.startswith(prefix):
+        return None
+    key = url[len(prefix):].split("?", 1)[0]
+    return key if key.startswith("listings/") else None
+
+
+def variant_key(original_key: str, variant: str, image_format: str) -> str:
+    """listings/<uuid>.jpg -> listings/<uuid>/<variant>.<format>"""
+    stem = original_key.rsplit(".", 1)[0]
+    return f"{stem}/{variant}.{image_format}"
+
+
+def available_formats() -> List[str]:
+    """Configured output formats this Pillow build can encode"""
+    formats = []
+    Image.init()
+    for image_format in settings.IMAGE_VARIANT_FORMATS:
+        encoder = ENCODERS.get(image_format)
+        if encoder is not None and encoder["format"] in Image.SAVE:
+            formats.append(image_format)
+    return formats
+
+
+def _load(body: bytes) -> Image.Image:
+    """Decode an upload, applying its EXIF orientation and dropping all metadata"""
+    image = Image.open(BytesIO(body))
+    # Let the JPEG decoder downscale by a power of two when the original is
+    # much larger than the biggest variant; far cheaper than a full decode
+    largest = max(VARIANT_SIZES.values())
+    image.draft("RGB", (largest, largest))
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    mode = "RGBA" if has_alpha else "RGB"
+    # convert() returns a fresh image without the EXIF/XMP payload
+    return image.convert(mode)
+
+
+def process_image(key: str, formats: List[str]) -> Dict[str, object]:
+    """
+    Build and upload every variant of one original image.
+
+    Runs in a pool worker process.
+
+    Args:
+        key: S3 key of the original upload
+        formats: Output formats to encode, e.g. ["webp", "avif"]
+
+    Returns:
+        {"original": url, "<variant>": {"<format>": url, ...}, ...}
+    """
+    s3 = get_client("s3")
+    body = s3.get_object(Bucket=settings.S3_BUCKET, Key=key)["Body"].read()
+    image = _load(body)
+
+    result: Dict[str, object] = {"original": public_url(key)}
+    # Largest first, each variant resized from the previous one
+    for variant, size in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        urls = {}
+        for image_format in formats:
+            encoder = ENCODERS[image_format]
+            buffer = BytesIO()
+            image.save(buffer, format=encoder["format"], **encoder["options"])
+            out_key = variant_key(key, variant, image_format)
+            s3.put_object(
+                Bucket=settings.S3_BUCKET,
+                Key=out_key,
+                Body=buffer.getvalue(),
+                ContentType=encoder["content_type"],
+                CacheControl=VARIANT_CACHE_CONTROL,
+                ServerSideEncryption="AES256",
+            )
+            urls[image_format] = public_url(out_key)
+        result[variant] = urls
+    return result
+
+
+def process_listing_images(image_urls: List[str], formats: List[str]) -> List[Dict[str, object]]:
+    """
+    Build variants for every uploaded image of a listing, in order.
+
+    Images hosted elsewhere, or that fail to process, get an entry with
+    only the original URL so clients can fall back to it.
+    """
+    variants = []
+    for url in image_urls:
+        key = key_from_url(url)
+        if key is None:
+            variants.append({"original": url})
+            continue
+        try:
+            variants.append(process_image(key, formats))
+        except Exception as e:
+            logger.error(f"Image processing failed for {key}: {e}")
+            variants.append({"original": url})
+    return variants
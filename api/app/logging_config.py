@@ -0,0 +1,113 @@
+"""
+Non-blocking structured logging
+Log records are put on an in-memory queue by the calling thread and written
+as JSON lines by a background QueueListener, so slow stdout/log shipping
+never stalls the event loop.
+"""
+import atexit
+import copy
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from pythonjsonlogger import jsonlogger
+
+from .config import settings
+
+# Records buffered before new ones are dropped (only reached if the writer stalls)
+LOG_QUEUE_SIZE = 10000
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking or erroring when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (they may reference objects
+        # that change later) but leave formatting to the writer thread, so
+        # the traceback stays a separate JSON field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def json_formatter() -> logging.Formatter:
+    """One JSON object per line; `extra` fields become top-level keys"""
+    return jsonlogger.JsonFormatter(
+        "%(asctime)s %(name)s %(levelname)s %(message)s",
+        rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"},
+    )
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route all logging through a queue to a JSON stdout writer thread.
+
+    Replaces the root logger's handlers; safe to call more than once.
+
+    Args:
+        level: Root log level
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(json_formatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.handlers = [NonBlockingQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Drain the queue and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def should_log_request(status_code: Optional[int], duration_ms: float) -> bool:
+    """
+    Sampling decision for the per-request log line.
+
+    Errors (4xx/5xx, or no response at all) and requests slower than
+    REQUEST_LOG_SLOW_MS are always logged; everything else is kept with
+    probability REQUEST_LOG_SAMPLE_RATE.
+    """
+    if status_code is None or status_code >= 400:
+        return True
+    if duration_ms >= settings.REQUEST_LOG_SLOW_MS:
+        return True
+    rate = settings.REQUEST_LOG_SAMPLE_RATE
+    return rate >= 1.0 or random.random() < rate
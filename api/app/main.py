@@ -5,25 +5,33 @@ High-Tech, Low-Life. Year 2077.
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 
 from .config import settings
-from .database import engine, Base
+from .database import engine, async_engine, replicas, Base
 from .routers import listings
+from .pagination import NEXT_CURSOR_HEADER
+from .view_counter import view_counter
+from .trending import trending_feed
+from .content_moderation import shutdown_moderation_service
+from .moderation_queue import moderation_worker
+from .image_pipeline import image_pipeline
+from .responses import default_response_class
+from .logging_config import setup_logging, stop_logging
+from .metrics import CONTENT_TYPE_LATEST, render_metrics
+from .profiling import ProfilingMiddleware, instrument_engine, profiling_enabled
 from .middleware import (
     SecurityHeadersMiddleware,
     RequestLoggingMiddleware,
     ErrorHandlerMiddleware,
-    setup_rate_limiting,
+    MetricsMiddleware,
 )
+from .rate_limit import RateLimitMiddleware
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO if settings.ENVIRONMENT == "production" else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+# Configure logging: JSON lines written off the event loop by a queue listener
+setup_logging(level=logging.INFO if settings.ENVIRONMENT == "production" else logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
@@ -35,12 +43,26 @@ async def lifespan(app: FastAPI):
     # Startup: Create tables
     Base.metadata.create_all(bind=engine)
     logger.info(">>> Database connection established")
+    view_counter.start()
+    replicas.start()
+    image_pipeline.start()
+    await trending_feed.start()
+    if settings.MODERATION_QUEUE_ENABLED and settings.MODERATION_WORKER_IN_PROCESS:
+        moderation_worker.start()
     logger.info(">>> Content moderation AI: ONLINE")
     logger.info(">>> Authentication: DISABLED")
     logger.info(">>> CyberBazaar is live. Welcome to 2077.")
     yield
     # Shutdown: Cleanup if needed
     logger.info(">>> Shutting down CyberBazaar systems...")
+    await moderation_worker.stop()
+    await view_counter.stop()
+    await trending_feed.stop()
+    shutdown_moderation_service()
+    await image_pipeline.shutdown()
+    await async_engine.dispose()
+    await replicas.dispose()
+    stop_logging()
 
 
 # Create FastAPI app
@@ -49,33 +71,47 @@ app = FastAPI(
     description="Anonymous marketplace with AI-powered content moderation. No accounts required. Year 2077.",
     version="2077.1.0",
     lifespan=lifespan,
+    default_response_class=default_response_class(),
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
-# Setup rate limiting
-setup_rate_limiting(app)
-
 # Add security middlewares (order matters!)
 # 1. Error handler (outermost)
 app.add_middleware(ErrorHandlerMiddleware)
 
-# 2. Request logging
+# Opt-in request profiling (PROFILING_TOKEN / PROFILING_SAMPLE_RATE)
+if profiling_enabled():
+    for _engine in (engine, async_engine.sync_engine, *(r.sync_engine for r in replicas.engines)):
+        instrument_engine(_engine)
+    app.add_middleware(ProfilingMiddleware)
+
+# Rate limiting - rejects over-budget clients before routing; inside
+# metrics and logging so 429s are still counted and logged
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# 2. Metrics (per-route latency histograms, in-flight gauge)
+app.add_middleware(MetricsMiddleware)
+
+# 3. Request logging
 app.add_middleware(RequestLoggingMiddleware)
 
-# 3. Security headers
+# 4. Security headers
 app.add_middleware(SecurityHeadersMiddleware)
 
-# 4. GZip compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# 5. GZip compression for uncached responses; cached listing payloads are
+#    stored pre-compressed and pass through with their Content-Encoding
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
 
-# 5. CORS - Allow all origins for public marketplace
+# 6. CORS - Allow all origins for public marketplace
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Public marketplace - anyone can access
     allow_credentials=False,
     allow_methods=["GET", "POST", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "X-Cache", "Retry-After"],
     max_age=3600,
 )
 
@@ -97,6 +133,14 @@ def health_check():
     }
 
 
+# Prometheus scrape endpoint (blocked at nginx; scraped on the internal network)
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Process metrics in the Prometheus text format"""
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Root endpoint
 @app.get("/", status_code=status.HTTP_200_OK)
 def root():
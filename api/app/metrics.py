@@ -0,0 +1,147 @@
+"""
+Prometheus metrics
+Request latency and in-flight gauges, database pool state, moderation
+call latency/outcomes and presign timings, exposed on /metrics.
+
+With more than one gunicorn worker, set PROMETHEUS_MULTIPROC_DIR (see
+gunicorn.conf.py) so every worker writes its samples there and /metrics
+aggregates them, whichever worker serves the scrape. Pool gauges are read
+live from the serving worker only and carry its pid.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Set for multi-worker deployments; read by prometheus_client at import time
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Request latency buckets (seconds), from cache hits to slow model calls
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",  # Summed over running workers
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+MODERATION_CALL_DURATION = Histogram(
+    "moderation_model_call_seconds",
+    "Bedrock moderation call latency",
+    ["outcome"],  # ok, throttled, error
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0),
+)
+MODERATION_VERDICTS = Counter(
+    "moderation_verdicts_total",
+    "Moderation verdicts by deciding stage",
+    ["stage", "decision"],  # stage: rule_*, cache, model; decision: approved, rejected
+)
+
+PRESIGN_DURATION = Histogram(
+    "s3_presign_batch_seconds",
+    "Time to sign one batch of presigned upload forms",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+
+
+@contextmanager
+def observe(histogram) -> Iterator[None]:
+    """Time the enclosed block into a (labelled) histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started)
+
+
+class _TimedCheckout:
+    """Mixin timing QueuePool checkouts; labelled by the engine's pool_logging_name"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self._orig_logging_name or "default").observe(
+                time.perf_counter() - started
+            )
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool for sync engines that records checkout wait time"""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Async-adapted QueuePool that records checkout wait time"""
+
+
+class PoolCollector:
+    """Reads connection pool state at scrape time"""
+
+    def __init__(self, per_process: bool = False):
+        """
+        Args:
+            per_process: Add a `pid` label, for scrapes aggregated across workers
+        """
+        self._pools: Dict[str, Callable[[], object]] = {}
+        self._extra_labels = ["pid"] if per_process else []
+        self._extra_values = [str(os.getpid())] if per_process else []
+
+    def register(self, name: str, get_pool: Callable[[], object]):
+        """Track a pool; `get_pool` is called per scrape since dispose() replaces it"""
+        self._pools[name] = get_pool
+
+    def collect(self):
+        labels = ["pool", *self._extra_labels]
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=labels)
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=labels)
+        checked_in = GaugeMetricFamily("db_pool_checked_in", "Idle connections in the pool", labels=labels)
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections opened beyond pool_size (negative: unopened slots)", labels=labels
+        )
+        for name, get_pool in self._pools.items():
+            pool = get_pool()
+            if not isinstance(pool, QueuePool):
+                continue
+            values = [name, *self._extra_values]
+            size.add_metric(values, pool.size())
+            checked_out.add_metric(values, pool.checkedout())
+            checked_in.add_metric(values, pool.checkedin())
+            overflow.add_metric(values, pool.overflow())
+        yield from (size, checked_out, checked_in, overflow)
+
+
+pool_collector = PoolCollector(per_process=MULTIPROC_DIR is not None)
+
+if MULTIPROC_DIR:
+    # Samples live in MULTIPROC_DIR; the default registry only sees this worker's
+    scrape_registry = CollectorRegistry()
+    MultiProcessCollector(scrape_registry, path=MULTIPROC_DIR)
+else:
+    scrape_registry = REGISTRY
+scrape_registry.register(pool_collector)
+
+
+def render_metrics() -> bytes:
+    """Current metrics in the Prometheus text format"""
+    return generate_latest(scrape_registry)
+
@@ -1,112 +1,187 @@
-"""Security and rate limiting middleware"""
-from fastapi import Request, HTTPException, status
+"""Security, logging, metrics and error handling middleware"""
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
+from typing import Optional
 import time
 import logging
 
-logger = logging.getLogger(__name__)
+from .config import settings
+from .logging_config import should_log_request
+from .metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """Add security headers to all responses"""
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    # Security headers
+    HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    }
 
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.HEADERS.items():
+                    headers[name] = value
+            await send(message)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log all requests with timing"""
+        await self.app(scope, receive, send_with_headers)
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
 
-        # Log request
-        logger.info(
-            f"Request: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else None,
-            },
-        )
+class RequestLoggingMiddleware:
+    """
+    Log one structured line per request with timing.
 
-        try:
-            response = await call_next(request)
-
-            # Calculate duration
-            duration = time.time() - start_time
-
-            # Log response
-            logger.info(
-                f"Response: {response.status_code} - {duration:.3f}s",
-                extra={
-                    "status_code": response.status_code,
-                    "duration": duration,
-                    "path": request.url.path,
-                },
-            )
+    2xx/3xx responses are sampled (REQUEST_LOG_SAMPLE_RATE); errors and
+    requests slower than REQUEST_LOG_SLOW_MS are always logged.
+    """
 
-            return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = None
+        error = None
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
         except Exception as e:
-            logger.error(
-                f"Request failed: {str(e)}",
-                extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "error": str(e),
-                },
-                exc_info=True,
-            )
+            error = e
             raise
+        finally:
+            # Duration covers the full response, including streamed bodies
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            if error is not None or should_log_request(status_code, duration_ms):
+                self._log(scope, status_code, duration_ms, error)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: Optional[int], duration_ms: float, error: Optional[Exception]):
+        client = scope.get("client")
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code if error is None else 500,
+            "duration_ms": round(duration_ms, 2),
+            "client": client[0] if client else None,
+            "sample_rate": settings.REQUEST_LOG_SAMPLE_RATE,
+        }
+        if error is not None:
+            fields["error"] = str(error)
+            logger.error("Request failed", extra=fields, exc_info=error)
+        elif status_code >= 500:
+            logger.error("Request", extra=fields)
+        elif status_code >= 400 or duration_ms >= settings.REQUEST_LOG_SLOW_MS:
+            logger.warning("Request", extra=fields)
+        else:
+            logger.info("Request", extra=fields)
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template and in-flight requests.
+
+    Routes are labelled by their path template (e.g. /listings/{listing_id}),
+    resolved by the router into the shared scope; unmatched paths are
+    grouped under "unmatched" to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method, route.path if route is not None else "unmatched", str(status_code)
+            ).observe(time.perf_counter() - started)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """Global error handler"""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_tracking)
         except HTTPException:
             # Re-raise HTTP exceptions
             raise
         except Exception as e:
             logger.error(f"Unhandled exception: {str(e)}", exc_info=True)
 
-            return JSONResponse(
+            if response_started:
+                # Headers are already on the wire; let the server drop the connection
+                raise
+
+            response = JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "detail": "Internal server error",
                     "type": "internal_error",
                 },
             )
+            await response(scope, receive, send)
 
-
-def setup_rate_limiting(app):
-    """Setup rate limiting for the application"""
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-
-def get_limiter():
-    """Get the limiter instance"""
-    return limiter
@@ -1,8 +1,10 @@
 """SQLAlchemy ORM Models - Anonymous Marketplace"""
 from sqlalchemy import (
     Column, String, Boolean, DateTime, Integer, Numeric,
-    Text, ARRAY, Enum as SQLEnum
+    Text, ARRAY, Computed, ForeignKey, Index, Enum as SQLEnum
 )
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime
 import enum
 from .database import Base
@@ -29,9 +31,21 @@ class Condition(str, enum.Enum):
 
 
 class ListingStatus(str, enum.Enum):
+    PENDING_REVIEW = "PENDING_REVIEW"  # Awaiting the moderation queue
     ACTIVE = "ACTIVE"
     SOLD = "SOLD"
     DELETED = "DELETED"
+    REJECTED = "REJECTED"  # Blocked by content moderation
+
+
+# Full-text search document maintained by Postgres as a generated column.
+# Title terms rank above description terms; seller handles are indexed
+# without stemming so "NetRunner_99" stays searchable as typed.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(seller_name, '')), 'C')"
+)
 
 
 # Models
@@ -47,12 +61,37 @@ class Listing(Base):
     description = Column(Text, nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
     currency = Column(String, default="ED", nullable=False)  # Eurodollars (ED) for cyberpunk theme
-    category = Column(SQLEnum(Category), nullable=False, index=True)
-    condition = Column(SQLEnum(Condition), default=Condition.USED)
-    status = Column(SQLEnum(ListingStatus), default=ListingStatus.ACTIVE, index=True)
+    # native_enum=False: plain string binds, so the same queries work against
+    # VARCHAR columns (migrate_to_anonymous.py) and native Postgres enum types
+    category = Column(SQLEnum(Category, native_enum=False), nullable=False, index=True)
+    condition = Column(SQLEnum(Condition, native_enum=False), default=Condition.USED)
+    status = Column(SQLEnum(ListingStatus, native_enum=False), default=ListingStatus.ACTIVE, index=True)
     location = Column(String, nullable=False, index=True)
     seller_name = Column(String, nullable=False)  # Anonymous handle like "NetRunner_99"
     images = Column(ARRAY(String), default=[])
+    image_variants = Column(JSONB, nullable=True)  # Resized variants per image, filled by the image pipeline
     views = Column(Integer, default=0)
+    moderation_reason = Column(String, nullable=True)  # Set when moderation rejects the listing
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Deferred so regular listing reads never pull the tsvector over the wire
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+
+    __table_args__ = (
+        Index("ix_listings_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves the newest-first feed and its keyset cursor in one index scan
+        Index("ix_listings_status_created_at_id", "status", "created_at", "id"),
+    )
+
+
+class ModerationJob(Base):
+    """
+    Queued moderation work for a PENDING_REVIEW listing.
+    Workers lease rows with SELECT ... FOR UPDATE SKIP LOCKED and set claimed_at.
+    """
+    __tablename__ = "moderation_jobs"
+
+    listing_id = Column(String, ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    claimed_at = Column(DateTime, nullable=True)  # Lease start; NULL while unclaimed
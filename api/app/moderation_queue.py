@@ -0,0 +1,230 @@
+"""
+Asynchronous moderation queue
+New listings are stored as PENDING_REVIEW with a row in moderation_jobs.
+Workers lease jobs with SELECT ... FOR UPDATE SKIP LOCKED in a short
+transaction, so any number of them (in the API process or standalone) can
+drain the queue concurrently without holding locks during model calls.
+
+Run a standalone worker with: python -m app.moderation_queue
+
+A standalone worker can only invalidate the API's cached list pages through
+a shared response cache (RESPONSE_CACHE_URL). With the default in-process
+LRU, newly approved listings appear once the API's cached pages expire
+(RESPONSE_CACHE_TTL_SECONDS).
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union
+
+from sqlalchemy import or_
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .background import PeriodicTask
+from .cache import response_cache
+from .config import settings
+from .content_moderation import get_moderation_service
+from .database import SessionLocal
+from .image_pipeline import image_pipeline, queue_listing_images
+from .models import Listing, ListingStatus, ModerationJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_moderation(db: Union[Session, AsyncSession], listing_id: str):
+    """Queue a listing for moderation in the caller's transaction"""
+    db.add(ModerationJob(listing_id=listing_id, created_at=datetime.utcnow()))
+
+
+def _claim_jobs(batch_size: int) -> Tuple[datetime, List[str], List[Dict[str, str]]]:
+    """
+    Lease up to `batch_size` unclaimed (or expired) jobs in a short transaction.
+
+    Returns:
+        (lease timestamp identifying this claim, claimed listing IDs,
+        title/description of the claimed listings still PENDING_REVIEW)
+    """
+    db = SessionLocal()
+    try:
+        claimed_at = datetime.utcnow()
+        expired = claimed_at - timedelta(seconds=settings.MODERATION_QUEUE_LEASE_SECONDS)
+        jobs = (
+            db.query(ModerationJob)
+            .filter(or_(ModerationJob.claimed_at.is_(None), ModerationJob.claimed_at < expired))
+            .order_by(ModerationJob.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for job in jobs:
+            job.claimed_at = claimed_at
+        listing_ids = [job.listing_id for job in jobs]
+        pending = [
+            {"id": row.id, "title": row.title, "description": row.description}
+            for row in db.query(Listing.id, Listing.title, Listing.description).filter(
+                Listing.id.in_(listing_ids),
+                Listing.status == ListingStatus.PENDING_REVIEW,
+            )
+        ] if jobs else []
+        db.commit()
+        return claimed_at, listing_ids, pending
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _release_jobs(claimed_at: datetime, listing_ids: List[str]):
+    """Drop a failed claim so the jobs are retried without waiting for the lease to expire"""
+    db = SessionLocal()
+    try:
+        db.query(ModerationJob).filter(
+            ModerationJob.listing_id.in_(listing_ids),
+            ModerationJob.claimed_at == claimed_at,
+        ).update({ModerationJob.claimed_at: None}, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to release moderation jobs: {e}")
+    finally:
+        db.close()
+
+
+def _apply_verdicts(
+    claimed_at: datetime, listing_ids: List[str], verdicts: Dict[str, dict]
+) -> Tuple[List[Tuple[str, List[str]]], int]:
+    """
+    Write verdicts and delete the jobs, for jobs this worker still holds.
+
+    A job whose lease expired and was re-claimed by another worker is left
+    to that worker.
+
+    Returns:
+        ((listing ID, image URLs) of each approved listing, number rejected)
+    """
+    db = SessionLocal()
+    try:
+        owned = [
+            job.listing_id for job in (
+                db.query(ModerationJob)
+                .filter(ModerationJob.listing_id.in_(listing_ids), ModerationJob.claimed_at == claimed_at)
+                .with_for_update()
+                .all()
+            )
+        ]
+        now = datetime.utcnow()
+        approved = []
+        rejected = 0
+        for listing in db.query(Listing).filter(
+            Listing.id.in_([listing_id for listing_id in owned if listing_id in verdicts]),
+            Listing.status == ListingStatus.PENDING_REVIEW,
+        ):
+            result = verdicts[listing.id]
+            if result["approved"]:
+                listing.status = ListingStatus.ACTIVE
+                approved.append((listing.id, list(listing.images or [])))
+            else:
+                listing.status = ListingStatus.REJECTED
+                listing.moderation_reason = result["reason"]
+                rejected += 1
+                logger.warning(f"Listing {listing.id} rejected by content moderation: {result['reason']}")
+            listing.updated_at = now
+
+        if owned:
+            db.query(ModerationJob).filter(ModerationJob.listing_id.in_(owned)).delete(synchronize_session=False)
+        db.commit()
+        return approved, rejected
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def drain_once(batch_size: int) -> int:
+    """
+    Claim up to `batch_size` jobs, moderate them and apply the verdicts.
+
+    Claiming and applying are separate short transactions; no row lock is
+    held while Bedrock answers. Claimed jobs carry a lease
+    (MODERATION_QUEUE_LEASE_SECONDS): if the worker dies mid-batch, they
+    become claimable again once it expires. If the model call fails the
+    claim is released right away.
+
+    Returns:
+        Number of jobs processed
+    """
+    claimed_at, listing_ids, pending = _claim_jobs(batch_size)
+    if not listing_ids:
+        return 0
+
+    try:
+        moderation_service = get_moderation_service(
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION
+        )
+        results = moderation_service.moderate_batch(
+            [{"title": job["title"], "description": job["description"]} for job in pending]
+        )
+    except Exception:
+        _release_jobs(claimed_at, listing_ids)
+        raise
+
+    verdicts = {job["id"]: result for job, result in zip(pending, results)}
+    approved, rejected = _apply_verdicts(claimed_at, listing_ids, verdicts)
+
+    if approved:
+        # Newly active listings belong at the top of the feed
+        response_cache.invalidate_lists()
+    for listing_id, images in approved:
+        queue_listing_images(listing_id, images)
+
+    logger.info(f"Moderation queue: {len(approved)} approved, {rejected} rejected")
+    return len(listing_ids)
+
+
+def drain(batch_size: int) -> int:
+    """Process batches until the queue has no claimable jobs left"""
+    total = 0
+    while True:
+        processed = drain_once(batch_size)
+        total += processed
+        if processed < batch_size:
+            return total
+
+
+# In-process worker, started from the application lifespan
+moderation_worker = PeriodicTask(
+    "moderation-queue",
+    settings.MODERATION_QUEUE_POLL_SECONDS,
+    lambda: drain(settings.MODERATION_QUEUE_BATCH_SIZE),
+)
+
+
+def run_worker():
+    """Standalone worker loop"""
+    logger.info("Moderation worker started")
+    if not response_cache.backend.shared:
+        logger.warning(
+            "RESPONSE_CACHE_URL is not set: approvals cannot invalidate the API's cached list pages, "
+            "which refresh after RESPONSE_CACHE_TTL_SECONDS"
+        )
+    while True:
+        try:
+            processed = drain(settings.MODERATION_QUEUE_BATCH_SIZE)
+        except Exception as e:
+            logger.error(f"Moderation worker batch failed: {e}", exc_info=True)
+            processed = 0
+        # No event loop here: write finished image variants between batches
+        image_pipeline.store_completed()
+        if not processed:
+            time.sleep(settings.MODERATION_QUEUE_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_worker()
@@ -0,0 +1,48 @@
+"""
+Keyset (cursor) pagination for listing feeds
+Cursors are opaque to clients and encode the (created_at, id) of the last row seen
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, listing_id: str) -> str:
+    """
+    Encode the sort key of the last listing on a page as an opaque cursor.
+
+    Args:
+        created_at: Creation timestamp of the last listing returned
+        listing_id: ID of the last listing returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{listing_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string received from the client
+
+    Returns:
+        Tuple of (created_at, listing_id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, listing_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), listing_id
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -0,0 +1,134 @@
+"""
+Local SigV4 signing for S3 presigned POST uploads
+Builds upload policies for a whole batch of keys in one pass, without a
+botocore round of request-object construction per file.
+
+The signing key only depends on the date, region and service, so it is
+derived once per day and reused for every policy signed that day.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .aws_clients import get_session
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+SERVICE = "s3"
+
+
+class PresignError(Exception):
+    """Raised when upload URLs cannot be signed (e.g. no credentials)"""
+
+
+class PresignedPostSigner:
+    """
+    Signs S3 POST policies with AWS Signature Version 4.
+
+    Produces the same `{"url": ..., "fields": {...}}` shape as
+    boto3's generate_presigned_post.
+    """
+
+    def __init__(self, bucket: str, region: str):
+        self.bucket = bucket
+        self.region = region
+        self.url = f"https://{bucket}.s3.{region}.amazonaws.com/"
+        self._signing_key_cache: Tuple[Optional[tuple], Optional["hmac.HMAC"]] = (None, None)
+        self._lock = threading.Lock()
+
+    def _signer(self, date_stamp: str, access_key: str, secret_key: str) -> "hmac.HMAC":
+        """Keyed HMAC for the day's signing key; copied per signature to skip key setup"""
+        cache_id = (date_stamp, self.region, SERVICE, access_key)
+        with self._lock:
+            cached_id, signer = self._signing_key_cache
+            if cached_id == cache_id:
+                return signer
+
+        key = hmac.new(f"AWS4{secret_key}".encode("utf-8"), date_stamp.encode("utf-8"), hashlib.sha256).digest()
+        for part in (self.region, SERVICE, "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        signer = hmac.new(key, digestmod=hashlib.sha256)
+
+        with self._lock:
+            self._signing_key_cache = (cache_id, signer)
+        return signer
+
+    def presign_posts(
+        self,
+        keys: Iterable[str],
+        fields: Dict[str, str],
+        conditions: List[object],
+        expires_in: int = 3600,
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, object]]:
+        """
+        Build presigned POST forms for a batch of object keys.
+
+        Args:
+            keys: Object keys to authorize, one upload each
+            fields: Extra form fields every upload must send
+            conditions: Extra policy conditions (exact-match dicts or lists)
+            expires_in: Seconds until the policies expire
+            now: Signing time (defaults to the current UTC time)
+
+        Returns:
+            List of {"url", "fields"} dicts in the order of `keys`
+        """
+        credentials = get_session().get_credentials()
+        if credentials is None:
+            raise PresignError("No AWS credentials available for signing")
+        credentials = credentials.get_frozen_credentials()
+
+        now = now or datetime.utcnow()
+        date_stamp = now.strftime("%Y%m%d")
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        expiration = (now + timedelta(seconds=expires_in)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        credential = f"{credentials.access_key}/{date_stamp}/{self.region}/{SERVICE}/aws4_request"
+
+        signed_fields = {
+            **fields,
+            "x-amz-algorithm": ALGORITHM,
+            "x-amz-credential": credential,
+            "x-amz-date": amz_date,
+        }
+        if credentials.token:
+            signed_fields["x-amz-security-token"] = credentials.token
+
+        # Everything but the key is shared by the batch: serialize it once
+        shared_conditions = [
+            {"bucket": self.bucket},
+            *conditions,
+            {"x-amz-algorithm": ALGORITHM},
+            {"x-amz-credential": credential},
+            {"x-amz-date": amz_date},
+        ]
+        if credentials.token:
+            shared_conditions.append({"x-amz-security-token": credentials.token})
+        policy_prefix = (
+            '{"expiration":' + json.dumps(expiration)
+            + ',"conditions":' + json.dumps(shared_conditions, separators=(",", ":"))[:-1]
+            + ',{"key":'
+        )
+
+        signer = self._signer(date_stamp, credentials.access_key, credentials.secret_key)
+
+        posts = []
+        for key in keys:
+            policy = base64.b64encode(
+                (policy_prefix + json.dumps(key) + "}]}").encode("utf-8")
+            )
+            signature = signer.copy()
+            signature.update(policy)
+            posts.append({
+                "url": self.url,
+                "fields": {
+                    "key": key,
+                    **signed_fields,
+                    "policy": policy.decode("ascii"),
+                    "x-amz-signature": signature.hexdigest(),
+                },
+            })
+        return posts
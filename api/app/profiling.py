@@ -0,0 +1,185 @@
+"""
+Opt-in per-request profiling
+Wraps selected requests in a pyinstrument sampling profiler and records
+every SQL statement they run, then writes a speedscope flamegraph and a
+JSON report (timings, SQL) to PROFILING_OUTPUT_DIR.
+
+A request is profiled when it carries `X-Profile-Token: <PROFILING_TOKEN>`
+or is picked by PROFILING_SAMPLE_RATE. Requires the `pyinstrument` package;
+profiling is disabled (with a warning) when it is not installed.
+"""
+import contextvars
+import hmac
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Statements kept per report; the count and total time still cover all of them
+MAX_RECORDED_STATEMENTS = 200
+
+# SQL captured for the request currently being profiled (None: not profiling)
+_sql_capture: contextvars.ContextVar[Optional[List[Dict[str, object]]]] = contextvars.ContextVar(
+    "sql_capture", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_capture.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    captured = _sql_capture.get()
+    if captured is None:
+        return
+    started = conn.info.get("profile_query_start")
+    if not started:
+        return
+    # Statements only: bound parameters may carry user content
+    captured.append({
+        "statement": statement,
+        "duration_ms": round((time.perf_counter() - started.pop()) * 1000, 3),
+        "executemany": executemany,
+    })
+
+
+def instrument_engine(engine: Engine):
+    """Capture SQL timings on an engine (use `.sync_engine` for async engines)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _load_profiler():
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+    except ImportError:
+        logger.warning("Request profiling is configured but 'pyinstrument' is not installed; disabled")
+        return None, None
+    return Profiler, SpeedscopeRenderer
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests selected by the admin token header or by sampling.
+
+    Token requests are always profiled and get an X-Profile-Id response
+    header naming their report files. A sampled request is only profiled
+    when no other profile (token or sampled) is running.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.profiler_class, self.renderer_class = _load_profiler()
+        self.output_dir = settings.PROFILING_OUTPUT_DIR
+        # Profiles in progress (token and sampled); only touched on the event loop
+        self._active = 0
+
+    def _requested(self, scope: Scope) -> bool:
+        token = settings.PROFILING_TOKEN
+        if not token:
+            return False
+        for name, value in scope["headers"]:
+            if name == b"x-profile-token":
+                return hmac.compare_digest(value, token.encode("utf-8"))
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.profiler_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._requested(scope)
+        sampled = (
+            not requested
+            and settings.PROFILING_SAMPLE_RATE > 0
+            and random.random() < settings.PROFILING_SAMPLE_RATE
+        )
+        if not (requested or (sampled and self._active == 0)):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        status_code = None
+
+        async def send_with_profile_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if requested:
+                    MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        captured: List[Dict[str, object]] = []
+        token = _sql_capture.set(captured)
+        profiler = self.profiler_class(
+            interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled"
+        )
+        self._active += 1
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._active -= 1
+            _sql_capture.reset(token)
+
+        report = {
+            "id": profile_id,
+            "trigger": "token" if requested else "sample",
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_string": scope["query_string"].decode("latin-1"),
+            "status_code": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "sql_count": len(captured),
+            "sql_total_ms": round(sum(query["duration_ms"] for query in captured), 3),
+            "sql": captured[:MAX_RECORDED_STATEMENTS],
+        }
+        # Rendering and disk I/O stay off the event loop
+        try:
+            await run_in_threadpool(self._write, profile_id, session, report)
+        except Exception as e:
+            logger.error(f"Failed to write profile {profile_id}: {e}")
+
+    def _write(self, profile_id: str, session, report: Dict[str, object]):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, profile_id)
+        with open(f"{base}.speedscope.json", "w") as flamegraph:
+            flamegraph.write(self.renderer_class().render(session))
+        with open(f"{base}.json", "w") as summary:
+            json.dump(report, summary, indent=2)
+        logger.info(
+            "Request profile written",
+            extra={
+                "profile_id": profile_id,
+                "path": report["path"],
+                "duration_ms": report["duration_ms"],
+                "sql_count": report["sql_count"],
+                "sql_total_ms": report["sql_total_ms"],
+            },
+        )
+
+
+def profiling_enabled() -> bool:
+    """Whether any profiling trigger is configured"""
+    return bool(settings.PROFILING_TOKEN) or settings.PROFILING_SAMPLE_RATE > 0
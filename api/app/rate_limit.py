@@ -0,0 +1,281 @@
+"""
+Shared rate limiting
+GCRA (generic cell rate algorithm) limits keyed on the real client IP, with
+state in a store every worker shares, so budgets hold no matter how many
+gunicorn workers serve the traffic.
+
+Stores:
+- MmapRateLimitStore: fixed-size hash table in a memory-mapped file, for
+  workers on the same host (default)
+- RedisRateLimitStore: one Lua script call per check over the asyncio
+  client, enabled with RATE_LIMIT_REDIS_URL. Requires the `redis` package.
+"""
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Never rate limited: container health checks and the metrics scraper
+EXEMPT_PATHS = {"/health", "/listings/health", "/metrics"}
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`limit` requests per `period` seconds, all of which may arrive as a burst"""
+
+    limit: int
+    period: int
+
+    @property
+    def interval(self) -> float:
+        """Seconds of budget one request consumes"""
+        return self.period / self.limit
+
+    @property
+    def burst_window(self) -> float:
+        return self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimitRule":
+        """Parse '10/minute' style limits"""
+        count, _, period = value.partition("/")
+        try:
+            return cls(limit=int(count), period=PERIODS[period.strip().rstrip("s")])
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid rate limit {value!r}; expected e.g. '10/minute'")
+
+    def __str__(self) -> str:
+        unit = next(name for name, seconds in PERIODS.items() if seconds == self.period)
+        return f"{self.limit} per 1 {unit}"
+
+
+def gcra(tat: float, now: float, rule: RateLimitRule) -> Tuple[bool, float, float, int]:
+    """
+    One GCRA decision.
+
+    Args:
+        tat: Stored theoretical arrival time for the key (0 if unseen)
+        now: Current time in seconds
+        rule: Budget to enforce
+
+    Returns:
+        (allowed, TAT to store, seconds until retry, remaining requests)
+    """
+    tat = max(tat, now)
+    new_tat = tat + rule.interval
+    allow_at = new_tat - rule.burst_window
+    if now < allow_at:
+        return False, tat, allow_at - now, 0
+    remaining = int((rule.burst_window - (new_tat - now)) / rule.interval)
+    return True, new_tat, 0.0, remaining
+
+
+class RateLimitStore(ABC):
+    """Atomically applies a GCRA decision to a key's stored state"""
+
+    @abstractmethod
+    async def check(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, int]:
+        """Returns (allowed, retry_after_seconds, remaining)"""
+
+
+class MmapRateLimitStore(RateLimitStore):
+    """
+    Open-addressing hash table of (key hash, TAT) slots in a shared file.
+
+    Every worker maps the same file; an exclusive flock around the probe
+    and update keeps decisions atomic across processes. Expired slots are
+    reused, and when a probe window is full the stalest entry is evicted,
+    which at worst resets that client's budget early. A check is a few
+    microseconds of memory access under the lock, so it runs on the loop.
+    """
+
+    SLOT = struct.Struct("<Qd")
+    PROBES = 8
+
+    def __init__(self, path: str, slots: int):
+        self.slots = slots
+        size = slots * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size != size:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.ftruncate(self._fd, size)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+        # flock does not exclude threads sharing this descriptor
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest or 1  # 0 marks an empty slot
+
+    async def check(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, int]:
+        return self._check(key, rule)
+
+    def _check(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, int]:
+        key_hash = self._hash(key)
+        start = key_hash % self.slots
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                target = None
+                stalest = None
+                for probe in range(self.PROBES):
+                    offset = ((start + probe) % self.slots) * self.SLOT.size
+                    slot_hash, tat = self.SLOT.unpack_from(self._map, offset)
+                    if slot_hash == key_hash:
+                        target = (offset, tat)
+                        break
+                    if target is None and (slot_hash == 0 or tat <= now):
+                        target = (offset, 0.0)  # Free or expired: claim unless the key turns up later
+                    if stalest is None or tat < stalest[1]:
+                        stalest = (offset, tat)
+                offset, tat = target if target is not None else (stalest[0], 0.0)
+
+                allowed, new_tat, retry_after, remaining = gcra(tat, now, rule)
+                self.SLOT.pack_into(self._map, offset, key_hash, new_tat)
+                return allowed, retry_after, remaining
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """GCRA in a Lua script: one round trip per check, clock taken from Redis"""
+
+    SCRIPT = """
+    local interval = tonumber(ARGV[1])
+    local burst_window = tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    local allow_at = new_tat - burst_window
+    if now < allow_at then
+        return {0, tostring(allow_at - now), 0}
+    end
+    redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+    return {1, '0', math.floor((burst_window - (new_tat - now)) / interval)}
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the 'redis' package is not installed") from e
+        self.client = aioredis.Redis.from_url(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    async def check(self, key: str, rule: RateLimitRule) -> Tuple[bool, float, int]:
+        allowed, retry_after, remaining = await self._script(
+            keys=[f"rl:{key}"], args=[rule.interval, rule.burst_window]
+        )
+        return bool(allowed), float(retry_after), int(remaining)
+
+
+def create_store() -> RateLimitStore:
+    """Redis when RATE_LIMIT_REDIS_URL is set, else the shared mmap table"""
+    if settings.RATE_LIMIT_REDIS_URL:
+        logger.info("Rate limit store: redis")
+        return RedisRateLimitStore(settings.RATE_LIMIT_REDIS_URL)
+    return MmapRateLimitStore(settings.RATE_LIMIT_MMAP_PATH, settings.RATE_LIMIT_MMAP_SLOTS)
+
+
+def client_ip(scope: Scope) -> str:
+    """
+    Real client address behind TRUSTED_PROXY_COUNT reverse proxies.
+
+    Each trusted proxy appends the address it saw to X-Forwarded-For, so
+    the client is the entry that many places from the right; anything
+    further left is client-supplied and ignored.
+    """
+    trusted = settings.TRUSTED_PROXY_COUNT
+    if trusted > 0:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                if hops:
+                    return hops[-min(trusted, len(hops))]
+                break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Enforce per-client budgets before requests reach the application.
+
+    Routes listed in RATE_LIMIT_ROUTES get their own budget. Other routes
+    are unlimited unless RATE_LIMIT_DEFAULT is set, in which case they
+    share that budget. Each limited request costs one store check. If the
+    store fails, requests are allowed (fail open).
+    """
+
+    def __init__(self, app: ASGIApp, store: Optional[RateLimitStore] = None):
+        self.app = app
+        self.store = store or create_store()
+        self.default_rule: Optional[RateLimitRule] = (
+            RateLimitRule.parse(settings.RATE_LIMIT_DEFAULT) if settings.RATE_LIMIT_DEFAULT else None
+        )
+        self.route_rules: Dict[str, RateLimitRule] = {
+            path.rstrip("/"): RateLimitRule.parse(limit) for path, limit in settings.RATE_LIMIT_ROUTES.items()
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"].rstrip("/") or "/"
+        if path in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.route_rules.get(path)
+        bucket = path if rule is not None else "default"
+        rule = rule or self.default_rule
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            allowed, retry_after, remaining = await self.store.check(f"{bucket}:{client_ip(scope)}", rule)
+        except Exception as e:
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=429,
+            content={"error": f"Rate limit exceeded: {rule}"},
+            headers={
+                "Retry-After": str(math.ceil(retry_after)),
+                "X-RateLimit-Limit": str(rule.limit),
+                "X-RateLimit-Remaining": str(remaining),
+            },
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,68 @@
+"""
+JSON response classes
+orjson-backed default response class, plus a helper that serializes Pydantic
+models to bytes in a single pass through pydantic-core.
+"""
+from decimal import Decimal
+from typing import Any, Optional, Type
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from .config import settings
+
+
+def _orjson_default(value: Any):
+    """Types orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        # Same representation Pydantic uses, so prices keep their exact scale
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    datetime, UUID, dataclasses and enums (including the str-based Category,
+    Condition and ListingStatus) are serialized natively; Decimal becomes a
+    string, matching Pydantic's output.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+RESPONSE_CLASSES = {
+    "orjson": ORJSONResponse,
+    "json": JSONResponse,
+}
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class selected by JSON_RESPONSE_BACKEND"""
+    try:
+        return RESPONSE_CLASSES[settings.JSON_RESPONSE_BACKEND]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON_RESPONSE_BACKEND {settings.JSON_RESPONSE_BACKEND!r}; "
+            f"expected one of {sorted(RESPONSE_CLASSES)}"
+        )
+
+
+def model_response(model: BaseModel, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Serialize a Pydantic model straight to a JSON response.
+
+    Skips FastAPI's response_model round trip (model -> dict -> JSON); the
+    route's response_model still documents the schema.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
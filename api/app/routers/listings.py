@@ -2,37 +2,83 @@
 Listings routes - Anonymous marketplace
 No authentication required, content moderation via AWS Bedrock
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
-from typing import List, Optional, Dict
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, desc, func, literal_column, select, tuple_
+from pydantic import TypeAdapter
+from typing import Any, List, Literal, Optional, Dict, Union
+import math
 import uuid
 from datetime import datetime
-import boto3
 from botocore.exceptions import ClientError
 import logging
 
-from ..database import get_db
+from ..database import get_async_db, get_read_db, is_replica_session, reads_from_primary, stick_to_primary
 from ..models import Listing, ListingStatus, Category
-from ..schemas import ListingCreate, ListingUpdate, ListingResponse, ModerationResult
-from ..content_moderation import get_moderation_service
+from ..schemas import (
+    ListingCreate, ListingUpdate, ListingResponse, ListingCard, ModerationResult,
+    ModerationStatusResponse, ListingFacets, FacetCount, PriceBucket
+)
+from ..cards import CARD_COLUMNS
+from ..content_moderation import ModerationBusyError, get_moderation_service
+from ..search import apply_search
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from ..view_counter import view_counter
+from ..trending import trending_feed
+from ..cache import CachedResponse, response_cache
+from ..moderation_queue import enqueue_moderation
+from ..aws_clients import get_client
+from ..presign import PresignedPostSigner, PresignError
+from ..image_pipeline import queue_listing_images
+from ..responses import model_response
+from ..etag import ETAG_CACHE_CONTROL, etag_matches, make_etag, not_modified
+from ..metrics import PRESIGN_DURATION, observe
 from ..config import settings
 
 router = APIRouter(prefix="/listings", tags=["Listings"])
 logger = logging.getLogger(__name__)
 
-# Initialize S3 client
+# Serializes ORM rows straight to JSON bytes for the response cache
+listing_list_adapter = TypeAdapter(List[ListingResponse])
+listing_card_adapter = TypeAdapter(List[ListingCard])
+
+# Price histogram edges for /facets (ED); the last bucket is open-ended
+PRICE_BUCKET_EDGES = (0, 100, 500, 1000, 5000, 10000, 50000)
+
+# Most common locations returned by /facets
+FACET_LOCATION_LIMIT = 20
+
+# Index of a listing's price bucket. Built from literal SQL rather than bound
+# parameters so the expression is textually identical in SELECT, GROUPING()
+# and GROUP BY, which Postgres requires.
+PRICE_BUCKET = case(
+    *[
+        (Listing.price < literal_column(str(edge)), literal_column(str(index)))
+        for index, edge in enumerate(PRICE_BUCKET_EDGES[1:])
+    ],
+    else_=literal_column(str(len(PRICE_BUCKET_EDGES) - 1)),
+)
+
+# GROUPING(category, condition, location, price bucket) bitmask -> facet;
+# a set bit means that column is not part of the row's grouping set
+FACET_GROUPS = {
+    0b0111: "categories",
+    0b1011: "conditions",
+    0b1101: "locations",
+    0b1110: "price",
+    0b1111: "total",
+}
+
+# Shared S3 client (pooled connections, reused across requests)
 try:
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION
-    )
+    s3_client = get_client('s3')
 except Exception as e:
     logger.warning(f"S3 client initialization failed: {e}. Image uploads will not work.")
     s3_client = None
 
+# Local SigV4 signer for presigned upload forms
+presigner = PresignedPostSigner(bucket=settings.S3_BUCKET, region=settings.AWS_REGION)
+
 
 @router.get("/health")
 def health_check():
@@ -49,7 +95,7 @@ def health_check():
 @router.post("/upload-urls", status_code=status.HTTP_200_OK)
 def get_s3_upload_urls(
     file_count: int = Query(..., ge=1, le=10)
-) -> Dict[str, List[Dict[str, str]]]:
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Generate presigned S3 URLs for image uploads.
     No authentication required - anyone can upload images.
@@ -66,89 +112,222 @@ def get_s3_upload_urls(
             detail="Image upload service is currently unavailable"
         )
 
-    upload_urls = []
+    file_keys = [f"listings/{uuid.uuid4()}.jpg" for _ in range(file_count)]
 
     try:
-        for i in range(file_count):
-            # Generate unique file key
-            file_key = f"listings/{uuid.uuid4()}.jpg"
-
-            # Generate presigned POST URL (more secure than PUT)
-            presigned_post = s3_client.generate_presigned_post(
-                Bucket=settings.S3_BUCKET,
-                Key=file_key,
-                Fields={
+        # Sign every POST policy in one pass (signing key derived once per day)
+        with observe(PRESIGN_DURATION):
+            presigned_posts = presigner.presign_posts(
+                file_keys,
+                fields={
                     "Content-Type": "image/jpeg",
                     "x-amz-server-side-encryption": "AES256"
                 },
-                Conditions=[
+                conditions=[
                     {"Content-Type": "image/jpeg"},
                     ["content-length-range", 0, 10485760],  # Max 10MB
                     {"x-amz-server-side-encryption": "AES256"}
                 ],
-                ExpiresIn=3600  # 1 hour
+                expires_in=3600  # 1 hour
             )
-
-            upload_urls.append({
-                "file_key": file_key,
-                "upload_url": presigned_post["url"],
-                "fields": presigned_post["fields"],
-                "public_url": f"https://{settings.S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
-            })
-
-    except ClientError as e:
+    except (ClientError, PresignError) as e:
         logger.error(f"Failed to generate upload URLs: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate upload URLs: {str(e)}"
         )
 
+    upload_urls = [
+        {
+            "file_key": file_key,
+            "upload_url": presigned_post["url"],
+            "fields": presigned_post["fields"],
+            "public_url": f"https://{settings.S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{file_key}"
+        }
+        for file_key, presigned_post in zip(file_keys, presigned_posts)
+    ]
+
     return {"upload_urls": upload_urls}
 
 
-@router.get("", response_model=List[ListingResponse])
-def get_listings(
+def _cached_json(
+    entry: CachedResponse,
+    cache_status: str,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """
+    Build a JSON response from a cache entry.
+
+    Sends the pre-compressed variant the client accepts (GZipMiddleware and
+    nginx pass Content-Encoding responses through untouched), or a 304 if
+    the client already holds the entry.
+    """
+    body, headers = entry.negotiate(accept_encoding)
+    headers["X-Cache"] = cache_status
+    etag = headers.get("ETag")
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag, {name: value for name, value in headers.items() if name in ("Vary", "X-Cache")})
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _may_cache(db: AsyncSession) -> bool:
+    """Replica reads shortly after a write may predate it; keep those out of the cache"""
+    return not is_replica_session(db) or not await response_cache.within_lag_window_async()
+
+
+def _filter_params(
+    category: Optional[Category],
+    search: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    location: Optional[str],
+) -> Dict[str, Any]:
+    """Normalize filter parameters so equivalent queries share a cache entry"""
+    return {
+        "category": category.value if category else None,
+        "search": " ".join(search.lower().split()) if search else None,
+        "min_price": min_price,
+        "max_price": max_price,
+        "location": location.strip().lower() if location else None,
+    }
+
+
+def _apply_filters(
+    query,
+    category: Optional[Category],
+    search: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    location: Optional[str],
+):
+    """
+    Restrict a listings query to active listings matching the browse filters.
+
+    Returns:
+        Tuple of (filtered query, search rank expression or None)
+    """
+    query = query.filter(Listing.status == ListingStatus.ACTIVE)
+    rank = None
+    if category:
+        query = query.filter(Listing.category == category)
+    if search:
+        query, rank = apply_search(query, search)
+    if min_price is not None:
+        query = query.filter(Listing.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Listing.price <= max_price)
+    if location:
+        query = query.filter(Listing.location.ilike(f"%{location}%"))
+    return query, rank
+
+
+@router.get("", response_model=Union[List[ListingResponse], List[ListingCard]])
+async def get_listings(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
     category: Optional[Category] = None,
     search: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     location: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Literal["full", "card"] = Query("full", description="'card' returns compact ListingCard rows for grids"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all active listings with optional filters.
     Public endpoint - no authentication required.
+
+    `search` runs against the full-text index with prefix matching;
+    results are ranked by relevance, then newest first.
+
+    Newest-first feeds support keyset pagination: pass the X-Next-Cursor
+    header of one page as `cursor` to fetch the next. Every page costs the
+    same regardless of depth. `skip` is ignored when `cursor` is given.
+
+    `fields=card` selects only the columns a browse grid needs, with the
+    description cut to a short snippet and the first image only.
+
+    Responses are served from the response cache for up to
+    RESPONSE_CACHE_TTL_SECONDS; creating or selling a listing invalidates them.
+    Clients inside their read-your-writes window (stick_to_primary) skip
+    the cache and read the primary.
+
+    Responses carry an ETag hashed from the body; a matching If-None-Match
+    gets a 304. On a cache hit that needs no query or serialization.
     """
-    query = db.query(Listing).filter(Listing.status == ListingStatus.ACTIVE)
+    if cursor and search:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not supported for search results"
+        )
 
-    # Apply filters
-    if category:
-        query = query.filter(Listing.category == category)
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Listing.title.ilike(search_filter),
-                Listing.description.ilike(search_filter),
-                Listing.seller_name.ilike(search_filter)
+    keyset = None
+    if cursor:
+        try:
+            keyset = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
             )
-        )
-    if min_price is not None:
-        query = query.filter(Listing.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Listing.price <= max_price)
-    if location:
-        query = query.filter(Listing.location.ilike(f"%{location}%"))
 
-    # Order by created_at descending (newest first)
-    query = query.order_by(desc(Listing.created_at))
+    # Normalize parameters so equivalent queries share a cache entry
+    params = {
+        "skip": None if cursor else skip,
+        "limit": limit,
+        "cursor": cursor,
+        **_filter_params(category, search, min_price, max_price, location),
+        "fields": fields,
+    }
+    sticky = reads_from_primary(request)
+    cache_key = await response_cache.list_key_async(params)
+    if not sticky:
+        cached = await response_cache.get_async(cache_key)
+        if cached is not None:
+            return _cached_json(cached, "HIT", accept_encoding, if_none_match)
+
+    card = fields == "card"
+    query = select(*CARD_COLUMNS) if card else select(Listing)
+    query, rank = _apply_filters(query, category, search, min_price, max_price, location)
+
+    # Order by relevance when searching, otherwise newest first with id as tiebreaker
+    if rank is not None:
+        query = query.order_by(desc(rank), desc(Listing.created_at))
+    else:
+        query = query.order_by(desc(Listing.created_at), desc(Listing.id))
 
     # Paginate
-    listings = query.offset(skip).limit(limit).all()
+    if keyset:
+        query = query.filter(tuple_(Listing.created_at, Listing.id) < tuple_(*keyset))
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit)
+    listings = (await db.execute(query)).all() if card else (await db.scalars(query)).all()
+
+    headers = {}
+    # A full page on the newest-first feed means there may be more
+    if rank is None and len(listings) == limit:
+        last = listings[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+
+    if card:
+        body = listing_card_adapter.dump_json(
+            listing_card_adapter.validate_python([row._mapping for row in listings])
+        )
+    else:
+        body = listing_list_adapter.dump_json(
+            listing_list_adapter.validate_python(listings, from_attributes=True)
+        )
 
-    return listings
+    entry = CachedResponse.build(body, headers)
+    if not sticky and await _may_cache(db):
+        await response_cache.set_async(cache_key, entry)
+    return _cached_json(entry, "MISS", accept_encoding, if_none_match)
 
 
 @router.get("/categories", response_model=List[str])
@@ -157,16 +336,148 @@ def get_categories():
     return [category.value for category in Category]
 
 
+@router.get("/trending", response_model=List[ListingCard])
+async def get_trending(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Hot listings as ListingCard rows: views with time decay, so a burst of
+    interest in a new listing outranks an old listing's lifetime total.
+
+    Served from the in-memory ranking refreshed every
+    TRENDING_REFRESH_SECONDS; reads never touch the database. Only the top
+    TRENDING_FEED_SIZE listings are ranked, so later pages are empty.
+    """
+    snapshot = trending_feed.snapshot
+    etag = make_etag(snapshot.version, skip, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return Response(
+        content=snapshot.page(skip, limit),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL},
+    )
+
+
+@router.get("/facets", response_model=ListingFacets)
+async def get_facets(
+    request: Request,
+    category: Optional[Category] = None,
+    search: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    location: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Per-category, per-condition, per-location and price-bucket counts for
+    the active listings matching the given filters (same filters as GET
+    /listings), plus the total.
+
+    All counts come from a single GROUPING SETS aggregate and are cached
+    like list pages. Only the FACET_LOCATION_LIMIT most common locations
+    are returned; every price bucket is, including empty ones.
+    """
+    filters = _filter_params(category, search, min_price, max_price, location)
+    sticky = reads_from_primary(request)
+    cache_key = await response_cache.list_key_async({"facets": True, **filters})
+    if not sticky:
+        cached = await response_cache.get_async(cache_key)
+        if cached is not None:
+            return _cached_json(cached, "HIT", accept_encoding, if_none_match)
+
+    query = select(
+        Listing.category,
+        Listing.condition,
+        Listing.location,
+        PRICE_BUCKET.label("price_bucket"),
+        func.grouping(Listing.category, Listing.condition, Listing.location, PRICE_BUCKET).label("grouping"),
+        func.count().label("count"),
+    )
+    query, _ = _apply_filters(query, category, search, min_price, max_price, location)
+    query = query.group_by(func.grouping_sets(
+        tuple_(Listing.category),
+        tuple_(Listing.condition),
+        tuple_(Listing.location),
+        tuple_(PRICE_BUCKET),
+        tuple_(),
+    ))
+    rows = (await db.execute(query)).all()
+
+    total = 0
+    facets: Dict[str, List[FacetCount]] = {"categories": [], "conditions": [], "locations": []}
+    price_counts = [0] * len(PRICE_BUCKET_EDGES)
+    for row in rows:
+        group = FACET_GROUPS.get(row.grouping)
+        if group == "total":
+            total = row.count
+        elif group == "price":
+            price_counts[row.price_bucket] = row.count
+        elif group is not None:
+            value = {"categories": row.category, "conditions": row.condition, "locations": row.location}[group]
+            if value is not None:
+                facets[group].append(FacetCount(value=getattr(value, "value", value), count=row.count))
+
+    for counts in facets.values():
+        counts.sort(key=lambda facet: (-facet.count, facet.value))
+    price = [
+        PriceBucket(
+            min=edge,
+            max=PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None,
+            count=price_counts[index],
+        )
+        for index, edge in enumerate(PRICE_BUCKET_EDGES)
+    ]
+
+    result = ListingFacets(
+        total=total,
+        categories=facets["categories"],
+        conditions=facets["conditions"],
+        locations=facets["locations"][:FACET_LOCATION_LIMIT],
+        price=price,
+    )
+    entry = CachedResponse.build(result.model_dump_json().encode("utf-8"))
+    if not sticky and await _may_cache(db):
+        await response_cache.set_async(cache_key, entry)
+    return _cached_json(entry, "MISS", accept_encoding, if_none_match)
+
+
 @router.get("/{listing_id}", response_model=ListingResponse)
-def get_listing(listing_id: str, db: Session = Depends(get_db)):
+async def get_listing(
+    listing_id: str,
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Get a specific listing by ID.
     Increments view count each time.
+
+    Read-only: the view is buffered by the write-behind view counter and
+    flushed in bulk, so this never takes a row lock. Served from the
+    response cache when possible. The view count shown is the last flushed
+    value, so it lags by up to VIEW_FLUSH_INTERVAL_SECONDS (or the cache TTL).
+
+    The ETag is hashed from the body, so it changes with the flushed view
+    count; a matching If-None-Match gets a 304. Revalidated fetches still
+    count as views.
     """
-    listing = db.query(Listing).filter(
+    sticky = reads_from_primary(request)
+    cache_key = response_cache.detail_key(listing_id)
+    cached = None if sticky else await response_cache.get_async(cache_key)
+    if cached is not None:
+        view_counter.increment(listing_id)
+        return _cached_json(cached, "HIT", accept_encoding, if_none_match)
+
+    listing = await db.scalar(select(Listing).filter(
         Listing.id == listing_id,
         Listing.status == ListingStatus.ACTIVE
-    ).first()
+    ))
 
     if not listing:
         raise HTTPException(
@@ -174,25 +485,93 @@ def get_listing(listing_id: str, db: Session = Depends(get_db)):
             detail="Listing not found or has been removed"
         )
 
-    # Increment view count
-    listing.views += 1
-    db.commit()
+    # Record the view; it shows up once the view counter flushes
+    view_counter.increment(listing.id)
+
+    entry = CachedResponse.build(ListingResponse.model_validate(listing).model_dump_json().encode("utf-8"))
+    if not sticky and await _may_cache(db):
+        await response_cache.set_async(cache_key, entry)
+    return _cached_json(entry, "MISS", accept_encoding, if_none_match)
 
+
+async def _save_listing(db: AsyncSession, listing: Listing, queue_moderation: bool = False) -> Listing:
+    """Insert a listing, optionally with its moderation job, and reload it"""
+    db.add(listing)
+    if queue_moderation:
+        await db.flush()
+        enqueue_moderation(db, listing.id)
+    await db.commit()
+    await db.refresh(listing)
     return listing
 
 
 @router.post("", response_model=ListingResponse, status_code=status.HTTP_201_CREATED)
-def create_listing(
+async def create_listing(
     listing_data: ListingCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new listing - NO AUTHENTICATION REQUIRED.
     Content is automatically moderated using AWS Bedrock AI.
 
     Listings with harmful, illegal, or inappropriate content will be rejected.
+
+    With MODERATION_QUEUE_ENABLED the listing is stored as PENDING_REVIEW
+    and moderated by a queue worker, so this returns without waiting on the
+    model; poll /listings/{id}/moderation for the verdict. Otherwise
+    moderation is awaited on its own executor with a MODERATION_TIMEOUT_SECONDS
+    budget, so in-flight model calls never hold the event loop.
     """
-    # Content moderation check
+    queued = settings.MODERATION_QUEUE_ENABLED
+    if not queued:
+        await _moderate_listing(listing_data)
+
+    # Create the listing
+    listing = Listing(
+        id=str(uuid.uuid4()),
+        title=listing_data.title,
+        description=listing_data.description,
+        price=listing_data.price,
+        currency=listing_data.currency,
+        category=listing_data.category,
+        condition=listing_data.condition,
+        location=listing_data.location,
+        seller_name=listing_data.seller_name,
+        images=listing_data.images,
+        status=ListingStatus.PENDING_REVIEW if queued else ListingStatus.ACTIVE,
+        views=0,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+
+    listing = await _save_listing(db, listing, queued)
+
+    if queued:
+        logger.info(f"New listing queued for moderation: {listing.id} by {listing.seller_name}")
+    else:
+        # Queued listings get their images processed once approved
+        queue_listing_images(listing.id, listing.images)
+        # New listing lands at the top of the feed
+        await response_cache.invalidate_lists_async()
+        logger.info(f"New listing created: {listing.id} by {listing.seller_name}")
+
+    response = model_response(ListingResponse.model_validate(listing), status_code=status.HTTP_201_CREATED)
+    stick_to_primary(response)
+    return response
+
+
+def _moderation_busy() -> HTTPException:
+    """503 for when every async moderation worker is occupied"""
+    logger.warning("Content moderation saturated, refusing request")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Content moderation is busy, please retry shortly",
+        headers={"Retry-After": str(math.ceil(settings.MODERATION_TIMEOUT_SECONDS))}
+    )
+
+
+async def _moderate_listing(listing_data: ListingCreate):
+    """Run inline content moderation; raises HTTP 400 if the content is rejected"""
     try:
         moderation_service = get_moderation_service(
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
@@ -200,9 +579,10 @@ def create_listing(
             region_name=settings.AWS_REGION
         )
 
-        moderation_result = moderation_service.moderate_content(
+        moderation_result = await moderation_service.moderate_content_async(
             title=listing_data.title,
-            description=listing_data.description
+            description=listing_data.description,
+            timeout=settings.MODERATION_TIMEOUT_SECONDS
         )
 
         if not moderation_result["approved"]:
@@ -224,40 +604,17 @@ def create_listing(
 
     except HTTPException:
         raise
+    except ModerationBusyError:
+        # Refuse rather than fail open, so a flood cannot skip moderation
+        raise _moderation_busy()
     except Exception as e:
         # If moderation service fails, log and continue (fail open)
         logger.error(f"Content moderation error: {e}")
         logger.warning("Allowing listing creation due to moderation service failure")
 
-    # Create the listing
-    listing = Listing(
-        id=str(uuid.uuid4()),
-        title=listing_data.title,
-        description=listing_data.description,
-        price=listing_data.price,
-        currency=listing_data.currency,
-        category=listing_data.category,
-        condition=listing_data.condition,
-        location=listing_data.location,
-        seller_name=listing_data.seller_name,
-        images=listing_data.images,
-        status=ListingStatus.ACTIVE,
-        views=0,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-
-    db.add(listing)
-    db.commit()
-    db.refresh(listing)
-
-    logger.info(f"New listing created: {listing.id} by {listing.seller_name}")
-
-    return listing
-
 
 @router.post("/moderate", response_model=ModerationResult)
-def moderate_content(
+async def moderate_content(
     title: str = Query(..., min_length=3, max_length=200),
     description: str = Query(..., min_length=10, max_length=5000)
 ):
@@ -272,13 +629,16 @@ def moderate_content(
             region_name=settings.AWS_REGION
         )
 
-        result = moderation_service.moderate_content(
+        result = await moderation_service.moderate_content_async(
             title=title,
-            description=description
+            description=description,
+            timeout=settings.MODERATION_TIMEOUT_SECONDS
         )
 
         return ModerationResult(**result)
 
+    except ModerationBusyError:
+        raise _moderation_busy()
     except Exception as e:
         logger.error(f"Moderation endpoint error: {e}")
         raise HTTPException(
@@ -329,12 +689,7 @@ Respond ONLY in this JSON format:
 
         # Call Bedrock to generate listing
         import json
-        bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
+        bedrock_runtime = get_client('bedrock-runtime')
 
         request_body = {
             "messages": [
@@ -390,13 +745,36 @@ Respond ONLY in this JSON format:
         )
 
 
+@router.get("/{listing_id}/moderation", response_model=ModerationStatusResponse)
+async def get_moderation_status(listing_id: str, db: AsyncSession = Depends(get_read_db)):
+    """
+    Moderation state of a listing.
+    Lets clients follow a PENDING_REVIEW listing until it goes ACTIVE or REJECTED.
+    """
+    listing = (await db.execute(
+        select(Listing.id, Listing.status, Listing.moderation_reason).filter(Listing.id == listing_id)
+    )).first()
+
+    if not listing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing not found"
+        )
+
+    return model_response(ModerationStatusResponse(
+        id=listing.id,
+        status=listing.status,
+        reason=listing.moderation_reason
+    ))
+
+
 @router.patch("/{listing_id}/mark-sold", response_model=ListingResponse)
-def mark_as_sold(listing_id: str, db: Session = Depends(get_db)):
+async def mark_as_sold(listing_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Mark a listing as sold.
     No authentication required - anyone can mark as sold.
     """
-    listing = db.query(Listing).filter(Listing.id == listing_id).first()
+    listing = await db.get(Listing, listing_id)
 
     if not listing:
         raise HTTPException(
@@ -407,9 +785,13 @@ def mark_as_sold(listing_id: str, db: Session = Depends(get_db)):
     listing.status = ListingStatus.SOLD
     listing.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(listing)
+    await db.commit()
+    await db.refresh(listing)
+
+    await response_cache.invalidate_listing_async(listing.id)
 
     logger.info(f"Listing marked as sold: {listing.id}")
 
-    return listing
+    response = model_response(ListingResponse.model_validate(listing))
+    stick_to_primary(response)
+    return response
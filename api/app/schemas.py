@@ -1,11 +1,15 @@
 """Pydantic schemas for request/response validation - Anonymous Marketplace"""
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Optional, List, Dict
 from datetime import datetime
 from decimal import Decimal
 from .models import Category, Condition, ListingStatus
 
 
+# Description characters kept in card responses
+CARD_SNIPPET_LENGTH = 160
+
+
 # ========== Listing Schemas ==========
 class ListingBase(BaseModel):
     title: str = Field(..., min_length=3, max_length=200)
@@ -33,16 +37,84 @@ class ListingUpdate(BaseModel):
     images: Optional[List[str]] = Field(None, max_length=10)
 
 
+class ImageVariants(BaseModel):
+    """Resized renditions of one uploaded image, keyed by format (webp, avif)"""
+    original: str
+    thumb: Dict[str, str] = Field(default_factory=dict)
+    card: Dict[str, str] = Field(default_factory=dict)
+    full: Dict[str, str] = Field(default_factory=dict)
+
+
 class ListingResponse(ListingBase):
     id: str
     status: ListingStatus
     images: List[str]
+    image_variants: List[ImageVariants] = Field(default_factory=list)
     views: int
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("image_variants", mode="before")
+    @classmethod
+    def _variants_pending(cls, value):
+        # NULL until the image pipeline has processed the listing
+        return value or []
+
+
+class ListingCard(BaseModel):
+    """Compact listing for browse grids (`GET /listings?fields=card`)"""
+    id: str
+    title: str
+    snippet: str
+    price: Decimal
+    currency: str
+    category: Category
+    condition: Condition
+    location: str
+    seller_name: str
+    image: Optional[str] = None
+    image_card: Optional[Dict[str, str]] = None
+    views: int = 0
+    created_at: datetime
+
+    @field_validator("snippet", mode="before")
+    @classmethod
+    def _truncate_snippet(cls, value):
+        # The query fetches one character past the limit to detect truncation
+        if value is None or len(value) <= CARD_SNIPPET_LENGTH:
+            return value or ""
+        cut = value[:CARD_SNIPPET_LENGTH].rsplit(" ", 1)[0]
+        return cut.rstrip(" ,.;:-") + "…"
+
+    @field_validator("views", mode="before")
+    @classmethod
+    def _default_views(cls, value):
+        return value or 0
+
+
+# ========== Facets ==========
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class PriceBucket(BaseModel):
+    """Listings priced in [min, max); max is None for the open-ended top bucket"""
+    min: int
+    max: Optional[int] = None
+    count: int
+
+
+class ListingFacets(BaseModel):
+    """Counts per filter value for the listings matching the current filters"""
+    total: int
+    categories: List[FacetCount]
+    conditions: List[FacetCount]
+    locations: List[FacetCount]
+    price: List[PriceBucket]
+
 
 # ========== Content Moderation ==========
 class ModerationResult(BaseModel):
@@ -51,6 +123,12 @@ class ModerationResult(BaseModel):
     confidence: str
 
 
+class ModerationStatusResponse(BaseModel):
+    id: str
+    status: ListingStatus
+    reason: Optional[str] = None
+
+
 # ========== Pagination ==========
 class PaginatedResponse(BaseModel):
     items: List[ListingResponse]
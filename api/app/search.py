@@ -0,0 +1,111 @@
+"""
+Full-text search helpers for listings
+Translates the free-text `search` parameter into a ranked Postgres tsquery
+"""
+import re
+from functools import reduce
+from typing import List, Optional
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_
+
+from .models import Listing
+
+# Text search configuration for titles and descriptions (see SEARCH_VECTOR_SQL)
+SEARCH_CONFIG = "english"
+
+# Configuration for seller handles, which are indexed without stemming
+HANDLE_SEARCH_CONFIG = "simple"
+
+# Upper bound on terms taken from a single search string
+MAX_SEARCH_TERMS = 8
+
+# Word characters without underscore, so handles like "NetRunner_99" split
+# the same way the Postgres text parser splits them
+_TERM_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def search_terms(search: str) -> List[str]:
+    """Lowercased words of a search string, capped at MAX_SEARCH_TERMS"""
+    return _TERM_RE.findall(search.lower())[:MAX_SEARCH_TERMS]
+
+
+def build_prefix_tsquery(search: str) -> Optional[str]:
+    """
+    Build a to_tsquery expression that prefix-matches every search term.
+
+    Terms are extracted as plain words, so user input can never inject
+    tsquery operators. "cyber deck" becomes "cyber:* & deck:*".
+
+    Args:
+        search: Raw search string from the client
+
+    Returns:
+        tsquery expression, or None if the string contains no searchable terms
+    """
+    terms = search_terms(search)
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _tsquery(config: str, expression: str):
+    """
+    to_tsquery with its arguments inlined as constants (terms are plain
+    words), so Postgres folds stopword checks at plan time even when the
+    statement is reused as a prepared statement.
+    """
+    return func.to_tsquery(
+        literal_column(f"'{config}'::regconfig"),
+        literal(expression, literal_execute=True),
+    )
+
+
+def _term_tsquery(term: str):
+    """
+    tsquery for one term: the stemmed prefix (titles, descriptions) OR the
+    prefix as typed (seller handles). An English stopword yields an empty
+    tsquery, which `&&` ignores, rather than a handle-only match.
+    """
+    english = _tsquery(SEARCH_CONFIG, f"{term}:*")
+    handle = _tsquery(HANDLE_SEARCH_CONFIG, f"{term}:*")
+    return case((func.numnode(english) == literal_column("0"), english), else_=english.op("||")(handle))
+
+
+def _ilike_filter(search: str):
+    search_filter = f"%{search}%"
+    return or_(
+        Listing.title.ilike(search_filter),
+        Listing.description.ilike(search_filter),
+        Listing.seller_name.ilike(search_filter)
+    )
+
+
+def apply_search(query, search: str):
+    """
+    Filter and rank a listings query by full-text relevance.
+
+    Uses the GIN-indexed `search_vector` column. Falls back to the legacy
+    ILIKE match when the search string has no word characters (e.g. "$$$")
+    or only English stopwords (e.g. "the"), which the full-text query
+    would drop entirely. The stopword check is on constant arguments, so
+    Postgres folds it at plan time.
+
+    Args:
+        query: SQLAlchemy query over Listing
+        search: Raw search string from the client
+
+    Returns:
+        Tuple of (filtered query, rank ordering expression or None)
+    """
+    expression = build_prefix_tsquery(search)
+    if expression is None:
+        return query.filter(_ilike_filter(search)), None
+
+    tsquery = reduce(lambda left, right: left.op("&&")(right), map(_term_tsquery, search_terms(search)))
+    has_terms = func.numnode(_tsquery(SEARCH_CONFIG, expression)) > literal_column("0")
+    query = query.filter(or_(
+        and_(has_terms, Listing.search_vector.op("@@")(tsquery)),
+        and_(~has_terms, _ilike_filter(search)),
+    ))
+    rank = func.ts_rank_cd(Listing.search_vector, tsquery)
+    return query, rank
@@ -0,0 +1,236 @@
+"""
+Trending listings feed
+A materialized "hot" ranking: a background task periodically scores active
+listings by views with time decay and keeps the top TRENDING_FEED_SIZE as
+pre-serialized cards in memory, so reads are a slice with no database work.
+
+Only one worker per host runs the ranking query: the worker holding an
+flock on TRENDING_LOCK_PATH refreshes from a read replica and publishes the
+snapshot to TRENDING_SNAPSHOT_PATH, and the other workers load that file
+when it changes. If the leader exits, the next worker to take the lock
+carries on.
+
+Score (Hacker News style gravity):
+    views / (age_hours + 2) ^ TRENDING_GRAVITY
+"""
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import desc, extract, func, select
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from .background import PeriodicTask
+from .cards import CARD_COLUMNS
+from .config import settings
+from .database import ReplicaSet, async_engine, replicas
+from .models import Listing, ListingStatus
+from .schemas import ListingCard
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TrendingSnapshot:
+    """One refresh of the ranking; replaced wholesale so readers never see a partial update"""
+
+    cards: Tuple[bytes, ...] = ()
+    version: str = "empty"  # Content hash: unchanged rankings keep their ETags
+    refreshed_at: Optional[datetime] = None
+
+    def page(self, skip: int, limit: int) -> bytes:
+        """JSON array of the cards ranked [skip, skip + limit)"""
+        return b"[" + b",".join(self.cards[skip:skip + limit]) + b"]"
+
+    def to_bytes(self) -> bytes:
+        """Header line followed by one serialized card per line"""
+        header = json.dumps({
+            "version": self.version,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }).encode("utf-8")
+        return b"\n".join((header, *self.cards))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "TrendingSnapshot":
+        header, *cards = raw.split(b"\n")
+        meta = json.loads(header)
+        refreshed_at = meta["refreshed_at"]
+        return cls(
+            cards=tuple(cards),
+            version=meta["version"],
+            refreshed_at=datetime.fromisoformat(refreshed_at) if refreshed_at else None,
+        )
+
+
+def trending_score(gravity: float):
+    """SQL expression for a listing's time-decayed popularity"""
+    # created_at is naive UTC (datetime.utcnow)
+    age_hours = extract("epoch", func.timezone("UTC", func.now()) - Listing.created_at) / 3600
+    return func.coalesce(Listing.views, 0) / func.power(func.greatest(age_hours, 0) + 2, gravity)
+
+
+class TrendingFeed:
+    """
+    In-memory trending ranking refreshed in the background.
+
+    Every TRENDING_SYNC_SECONDS each worker either refreshes (the leader,
+    once TRENDING_REFRESH_SECONDS have passed) or reloads the leader's
+    published snapshot if it changed. Between updates reads cost O(page).
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replica_set: ReplicaSet,
+        refresh_interval: float,
+        sync_interval: float,
+        size: int,
+        gravity: float,
+        lock_path: str,
+        snapshot_path: str,
+    ):
+        """
+        Args:
+            primary: Engine used when no read replica is available
+            replica_set: Read replicas preferred for refreshes
+            refresh_interval: Seconds between ranking refreshes (leader only)
+            sync_interval: Seconds between leader checks and snapshot reloads
+            size: Listings kept in the ranking
+            gravity: Time-decay exponent; higher favours newer listings
+            lock_path: File whose flock elects the refreshing worker
+            snapshot_path: File the leader publishes the ranking to
+        """
+        self.primary = primary
+        self.replicas = replica_set
+        self.refresh_interval = refresh_interval
+        self.size = size
+        self.gravity = gravity
+        self.lock_path = lock_path
+        self.snapshot_path = snapshot_path
+        self.snapshot = TrendingSnapshot()
+        self._lock_fd: Optional[int] = None
+        self._last_refresh = 0.0
+        self._loaded_mtime: Optional[int] = None
+        self._task = PeriodicTask("trending-sync", sync_interval, self.sync)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_fd is not None
+
+    def _try_lead(self) -> bool:
+        """Take the refresh lock if no other worker holds it"""
+        if self._lock_fd is None:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            self._lock_fd = fd
+            self._last_refresh = 0.0
+            logger.info(f"Trending feed: this worker (pid {os.getpid()}) now refreshes the ranking")
+        return True
+
+    async def _query(self, engine: AsyncEngine):
+        query = (
+            select(*CARD_COLUMNS)
+            .filter(Listing.status == ListingStatus.ACTIVE)
+            .order_by(desc(trending_score(self.gravity)), desc(Listing.created_at))
+            .limit(self.size)
+        )
+        async with engine.connect() as conn:
+            return (await conn.execute(query)).all()
+
+    async def refresh(self) -> int:
+        """
+        Recompute the ranking, on a read replica when one is available,
+        and publish it to the other workers.
+
+        Returns:
+            Number of listings in the new ranking
+        """
+        replica = self.replicas.choose()
+        if replica is None:
+            rows = await self._query(self.primary)
+        else:
+            try:
+                rows = await self._query(replica)
+            except (OperationalError, InterfaceError, OSError) as e:
+                self.replicas.mark_down(replica, e)
+                rows = await self._query(self.primary)
+
+        cards = tuple(
+            ListingCard.model_validate(row._mapping).model_dump_json().encode("utf-8") for row in rows
+        )
+        version = hashlib.blake2b(b"\n".join(cards), digest_size=16).hexdigest()
+        self.snapshot = TrendingSnapshot(cards=cards, version=version, refreshed_at=datetime.utcnow())
+        self._last_refresh = time.monotonic()
+        await run_in_threadpool(self._publish, self.snapshot)
+        logger.debug(f"Trending feed refreshed: {len(cards)} listings")
+        return len(cards)
+
+    def _publish(self, snapshot: TrendingSnapshot):
+        """Atomically replace the shared snapshot file"""
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(snapshot.to_bytes())
+        os.replace(tmp_path, self.snapshot_path)
+        self._loaded_mtime = os.stat(self.snapshot_path).st_mtime_ns
+
+    def _reload(self) -> bool:
+        """Load the leader's snapshot if it changed since the last load"""
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._loaded_mtime:
+            return False
+        with open(self.snapshot_path, "rb") as f:
+            self.snapshot = TrendingSnapshot.from_bytes(f.read())
+        self._loaded_mtime = mtime
+        return True
+
+    async def sync(self):
+        """Refresh if this worker leads and the ranking is due, else pick up the leader's"""
+        if self._try_lead():
+            if time.monotonic() - self._last_refresh >= self.refresh_interval:
+                await self.refresh()
+        else:
+            await run_in_threadpool(self._reload)
+
+    async def start(self):
+        """Build or load the first ranking, then keep it current"""
+        try:
+            await self.sync()
+        except Exception as e:
+            # Serve an empty feed until a later sync succeeds
+            logger.error(f"Initial trending feed sync failed: {e}")
+        self._task.start()
+
+    async def stop(self):
+        """Stop the background sync and hand leadership to another worker"""
+        await self._task.stop()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # Releases the flock
+            self._lock_fd = None
+
+
+# Process-wide feed, started from the application lifespan
+trending_feed = TrendingFeed(
+    async_engine,
+    replicas,
+    refresh_interval=settings.TRENDING_REFRESH_SECONDS,
+    sync_interval=settings.TRENDING_SYNC_SECONDS,
+    size=settings.TRENDING_FEED_SIZE,
+    gravity=settings.TRENDING_GRAVITY,
+    lock_path=settings.TRENDING_LOCK_PATH,
+    snapshot_path=settings.TRENDING_SNAPSHOT_PATH,
+)
@@ -0,0 +1,116 @@
+"""
+Write-behind view counter
+Buffers listing view increments in memory and flushes them in bulk,
+so reading a listing never opens a write transaction.
+"""
+import logging
+import threading
+from collections import Counter
+
+from sqlalchemy import Integer, String, column, func, update, values
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from .background import PeriodicTask
+from .config import settings
+from .database import engine
+from .models import Listing
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE statement when flushing a large buffer
+FLUSH_BATCH_SIZE = 1000
+
+
+class ViewCounter:
+    """
+    In-process aggregator for listing view counts.
+
+    `increment` is O(1) and lock-protected; `flush` swaps the buffer out and
+    applies every pending delta as one `UPDATE ... FROM (VALUES ...)` per
+    batch. Deltas from a failed flush are merged back and retried next time.
+    """
+
+    def __init__(self, engine: Engine, flush_interval: float):
+        """
+        Args:
+            engine: SQLAlchemy engine used for flushes
+            flush_interval: Seconds between background flushes
+        """
+        self.engine = engine
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._task = PeriodicTask("view-counter-flush", flush_interval, self.flush)
+
+    def increment(self, listing_id: str, count: int = 1):
+        """Record `count` views for a listing"""
+        with self._lock:
+            self._pending[listing_id] += count
+
+    def pending(self, listing_id: str) -> int:
+        """Views recorded for a listing that have not been flushed yet"""
+        with self._lock:
+            return self._pending.get(listing_id, 0)
+
+    def flush(self) -> int:
+        """
+        Write all buffered increments to the database.
+
+        Returns:
+            Number of listings updated
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, Counter()
+
+        items = list(pending.items())
+        try:
+            with self.engine.begin() as conn:
+                for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                    conn.execute(_bulk_increment_statement(items[start:start + FLUSH_BATCH_SIZE]))
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                self._pending.update(pending)
+            raise
+
+        logger.debug(f"Flushed view counts for {len(items)} listings")
+        return len(items)
+
+    def start(self):
+        """Start the periodic background flush"""
+        self._task.start()
+
+    async def stop(self):
+        """Stop the background flush and write out anything still buffered"""
+        # Waits for an in-flight flush, so deltas it puts back are included below
+        await self._task.stop()
+        try:
+            flushed = await run_in_threadpool(self.flush)
+            logger.info(f"Final view count flush: {flushed} listings")
+        except Exception as e:
+            logger.error(f"Final view count flush failed: {e}")
+
+
+def _bulk_increment_statement(items):
+    """UPDATE listings SET views = views + v.delta FROM (VALUES ...) AS v(id, delta)"""
+    deltas = values(
+        column("id", String),
+        column("delta", Integer),
+        name="view_deltas",
+    ).data(items)
+    listings = Listing.__table__
+    return (
+        update(listings)
+        .where(listings.c.id == deltas.c.id)
+        .values(
+            views=func.coalesce(listings.c.views, 0) + deltas.c.delta,
+            # Views are not content changes; keep the onupdate hook off updated_at
+            updated_at=listings.c.updated_at,
+        )
+    )
+
+
+# Process-wide counter, started from the application lifespan
+view_counter = ViewCounter(engine, settings.VIEW_FLUSH_INTERVAL_SECONDS)
@@ -0,0 +1 @@
+# Performance benchmarks (run from the api directory)
@@ -0,0 +1,182 @@
+"""
+Benchmark: middleware stack overhead
+Drives two otherwise identical apps in-process through the ASGI interface:
+one with the previous BaseHTTPMiddleware stack, one with the pure ASGI
+middleware in app.middleware. No server, network or database needed.
+
+/health returns a small dict; /listings replays a cached 50-item page
+(the response cache hit path), so the numbers isolate per-request
+middleware cost. The fake `receive` behaves like uvicorn's: it reports
+http.disconnect once the response has been sent.
+
+In-process ratios overstate the end-to-end gain: behind uvicorn, HTTP
+parsing and socket I/O are paid by both stacks. Benchmark under a real
+server before quoting throughput.
+
+Run from the api directory with the usual environment variables set:
+    python -m benchmarks.bench_middleware [--requests 5000]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, Request, Response, HTTPException, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware import ErrorHandlerMiddleware, RequestLoggingMiddleware, SecurityHeadersMiddleware
+
+logger = logging.getLogger("benchmarks.legacy")
+
+
+# ---- Previous BaseHTTPMiddleware implementations (kept for comparison) ----
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        return response
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        logger.info(
+            f"Request: {request.method} {request.url.path}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "client": request.client.host if request.client else None,
+            },
+        )
+        response = await call_next(request)
+        duration = time.time() - start_time
+        logger.info(
+            f"Response: {response.status_code} - {duration:.3f}s",
+            extra={"status_code": response.status_code, "duration": duration, "path": request.url.path},
+        )
+        return response
+
+
+class LegacyErrorHandlerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except HTTPException:
+            raise
+        except Exception:
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": "Internal server error", "type": "internal_error"},
+            )
+
+
+# ---- Apps under test ----
+
+LISTING = (
+    b'{"title":"Arasaka cyberdeck","description":"' + b"x" * 400 + b'","price":"1200.00",'
+    b'"currency":"ED","category":"HARDWARE","condition":"USED","location":"Watson",'
+    b'"seller_name":"NetRunner_99","id":"5f0c","status":"ACTIVE","images":[],"image_variants":[],'
+    b'"views":3,"created_at":"2077-01-01T00:00:00","updated_at":"2077-01-01T00:00:00"}'
+)
+LISTINGS_PAGE = b"[" + b",".join([LISTING] * 50) + b"]"
+
+
+def build_app(error_handler, request_logging, security_headers) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ONLINE", "marketplace": "CyberBazaar", "year": 2077}
+
+    @app.get("/listings")
+    async def listings():
+        return Response(content=LISTINGS_PAGE, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    # Same order as app.main
+    app.add_middleware(error_handler)
+    app.add_middleware(request_logging)
+    app.add_middleware(security_headers)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    return app
+
+
+async def request(app, path: str) -> int:
+    """Send one GET through the ASGI app and return the status code"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    status_code = None
+    response_complete = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # As uvicorn does: once the response is sent, report the disconnect.
+        # Blocking forever instead leaves BaseHTTPMiddleware's disconnect
+        # listener to be cancelled on every request, which skews the numbers.
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_complete.set()
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def measure(name: str, app, path: str, count: int) -> float:
+    for _ in range(100):  # warm up
+        await request(app, path)
+    started = time.perf_counter()
+    for _ in range(count):
+        assert await request(app, path) == 200
+    rate = count / (time.perf_counter() - started)
+    print(f"{name:<14} {path:<10} {rate:10.0f} req/s")
+    return rate
+
+
+async def run(count: int):
+    legacy = build_app(LegacyErrorHandlerMiddleware, LegacyRequestLoggingMiddleware, LegacySecurityHeadersMiddleware)
+    asgi = build_app(ErrorHandlerMiddleware, RequestLoggingMiddleware, SecurityHeadersMiddleware)
+    for path in ("/health", "/listings"):
+        before = await measure("BaseHTTP", legacy, path, count)
+        after = await measure("pure ASGI", asgi, path, count)
+        print(f"{'':<14} {path:<10} {after / before:9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per app and path")
+    args = parser.parse_args()
+
+    # Measure middleware cost, not log handler I/O
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
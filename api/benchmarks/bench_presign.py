@@ -0,0 +1,75 @@
+"""
+Benchmark: presigned upload URL generation
+Compares the batch SigV4 signer in app.presign with the per-file
+boto3 generate_presigned_post loop it replaced. No network access needed.
+
+Run from the api directory with the usual environment variables set:
+    python -m benchmarks.bench_presign [--files 10] [--iterations 2000]
+"""
+import argparse
+import time
+import uuid
+
+from app.aws_clients import get_client
+from app.config import settings
+from app.presign import PresignedPostSigner
+
+FIELDS = {
+    "Content-Type": "image/jpeg",
+    "x-amz-server-side-encryption": "AES256"
+}
+CONDITIONS = [
+    {"Content-Type": "image/jpeg"},
+    ["content-length-range", 0, 10485760],
+    {"x-amz-server-side-encryption": "AES256"}
+]
+
+
+def boto3_loop(s3_client, keys):
+    """The original implementation: one generate_presigned_post per file"""
+    # botocore appends to Fields/Conditions in place, so pass fresh copies
+    return [
+        s3_client.generate_presigned_post(
+            Bucket=settings.S3_BUCKET,
+            Key=key,
+            Fields=dict(FIELDS),
+            Conditions=list(CONDITIONS),
+            ExpiresIn=3600
+        )
+        for key in keys
+    ]
+
+
+def batch_signer(signer, keys):
+    return signer.presign_posts(keys, fields=FIELDS, conditions=CONDITIONS, expires_in=3600)
+
+
+def measure(name, func, iterations, file_count):
+    batches = [[f"listings/{uuid.uuid4()}.jpg" for _ in range(file_count)] for _ in range(iterations)]
+    func(batches[0])  # warm up
+    started = time.perf_counter()
+    for keys in batches:
+        func(keys)
+    elapsed = time.perf_counter() - started
+    per_batch_us = elapsed / iterations * 1e6
+    print(f"{name:<24} {per_batch_us:10.1f} us/batch {iterations / elapsed:10.0f} batches/s")
+    return per_batch_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10, help="Upload URLs per batch")
+    parser.add_argument("--iterations", type=int, default=2000, help="Batches per implementation")
+    args = parser.parse_args()
+
+    s3_client = get_client("s3")
+    signer = PresignedPostSigner(bucket=settings.S3_BUCKET, region=settings.AWS_REGION)
+
+    print(f"{args.iterations} batches of {args.files} upload URLs")
+    before = measure("boto3 loop", lambda keys: boto3_loop(s3_client, keys), args.iterations, args.files)
+    after = measure("batch signer", lambda keys: batch_signer(signer, keys), args.iterations, args.files)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
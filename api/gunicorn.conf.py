@@ -0,0 +1,28 @@
+"""
+Gunicorn hooks for multi-worker metrics
+Loaded automatically when gunicorn starts from the api directory.
+
+When PROMETHEUS_MULTIPROC_DIR is set, every worker writes its Prometheus
+samples to that directory (see app/metrics.py). Files left by a previous
+run are cleared before the workers start, and a worker's live gauges are
+dropped when it exits (e.g. recycled by --max-requests).
+"""
+import os
+import shutil
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    """Start every run with an empty metrics directory"""
+    if MULTIPROC_DIR:
+        shutil.rmtree(MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Stop reporting an exited worker's livesum gauges"""
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid, MULTIPROC_DIR)
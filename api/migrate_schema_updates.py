@@ -0,0 +1,120 @@
+"""
+Database Migration Script: Incremental Schema Updates
+Brings an existing listings table up to date with the current models.
+Fresh databases get the same schema from Base.metadata.create_all.
+
+Every statement is idempotent, so the script is safe to re-run.
+
+Locking:
+- SCHEMA_UPDATES run in one transaction. Adding the generated
+  search_vector column rewrites the whole listings table under an ACCESS
+  EXCLUSIVE lock (reads and writes wait until it finishes), so the first
+  run on a large table belongs in a maintenance window. Once the column
+  exists the statement is a no-op.
+- CONCURRENT_INDEXES are built afterwards with CREATE INDEX CONCURRENTLY
+  in autocommit mode, so they never block writes. An index left INVALID
+  by an interrupted build is dropped and rebuilt.
+
+Run with: python migrate_schema_updates.py
+"""
+
+from sqlalchemy import create_engine, text
+from app.config import settings
+from app.models import SEARCH_VECTOR_SQL
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+SCHEMA_UPDATES = [
+    # Full-text search: generated tsvector column (rewrites the table, see above)
+    f"""
+    ALTER TABLE listings
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED
+    """,
+    # Moderation queue: new listing states (only when status is a Postgres enum)
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'listingstatus') THEN
+            ALTER TYPE listingstatus ADD VALUE IF NOT EXISTS 'PENDING_REVIEW';
+            ALTER TYPE listingstatus ADD VALUE IF NOT EXISTS 'REJECTED';
+        END IF;
+    END
+    $$
+    """,
+    "ALTER TABLE listings ADD COLUMN IF NOT EXISTS moderation_reason VARCHAR",
+    """
+    CREATE TABLE IF NOT EXISTS moderation_jobs (
+        listing_id VARCHAR PRIMARY KEY REFERENCES listings (id) ON DELETE CASCADE,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_moderation_jobs_created_at ON moderation_jobs (created_at)",
+    # Image pipeline output (backfill with: python -m app.image_pipeline)
+    "ALTER TABLE listings ADD COLUMN IF NOT EXISTS image_variants JSONB",
+    # Moderation job leases (claimed in one transaction, applied in another)
+    "ALTER TABLE moderation_jobs ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP",
+]
+
+# (index name, CREATE INDEX CONCURRENTLY statement), built outside a transaction
+CONCURRENT_INDEXES = [
+    # Full-text search over the generated column
+    (
+        "ix_listings_search_vector",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_listings_search_vector ON listings USING gin (search_vector)",
+    ),
+    # Keyset pagination over the newest-first feed
+    (
+        "ix_listings_status_created_at_id",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_listings_status_created_at_id "
+        "ON listings (status, created_at, id)",
+    ),
+]
+
+
+def build_concurrent_indexes(engine):
+    """Build CONCURRENT_INDEXES without blocking writes, replacing any left INVALID"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, sql in CONCURRENT_INDEXES:
+            invalid = conn.execute(
+                text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ),
+                {"name": name},
+            ).first()
+            if invalid:
+                logger.warning(f"Dropping invalid index {name} left by an interrupted build")
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            conn.execute(text(sql))
+            logger.info(f"Executed: {' '.join(sql.split())[:60]}...")
+
+
+def migrate():
+    """Run database migration"""
+    engine = create_engine(settings.DATABASE_URL)
+
+    logger.info("Applying schema updates...")
+
+    with engine.connect() as conn:
+        try:
+            for sql in SCHEMA_UPDATES:
+                conn.execute(text(sql))
+                logger.info(f"Executed: {' '.join(sql.split())[:60]}...")
+
+            conn.commit()
+
+        except Exception as e:
+            logger.error(f"Migration failed: {e}")
+            conn.rollback()
+            raise
+
+    build_concurrent_indexes(engine)
+    logger.info("✓ Schema is up to date")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -11,7 +11,7 @@ import CyberNavbar from '../components/CyberNavbar';
 import ListingCard from '../components/ListingCard';
 import CreateListingModal from '../components/CreateListingModal';
 import Footer from '../components/Footer';
-import { Listing, Category, MOCK_LISTINGS } from './types';
+import { Listing, Category, ListingFacets, MOCK_LISTINGS } from './types';
 import { useScrollRevealBatch } from './hooks/useScrollReveal';
 import { getCategoryHeroImage } from './constants';
 
@@ -21,6 +21,7 @@ export default function HomePage() {
   const [isLoading, setIsLoading] = useState(true);
   const [selectedCategory, setSelectedCategory] = useState<Category | 'ALL'>('ALL');
   const [searchQuery, setSearchQuery] = useState('');
+  const [categoryCounts, setCategoryCounts] = useState<Record<string, number>>({});
 
   // Apply scroll reveal animations
   useScrollRevealBatch('.reveal');
@@ -30,6 +31,11 @@ export default function HomePage() {
     fetchListings();
   }, [selectedCategory, searchQuery]);
 
+  // Category chip counts follow the search, not the selected category
+  useEffect(() => {
+    fetchCategoryCounts();
+  }, [searchQuery]);
+
   const fetchListings = async () => {
     setIsLoading(true);
     try {
@@ -59,6 +65,26 @@ export default function HomePage() {
     }
   };
 
+  const fetchCategoryCounts = async () => {
+    try {
+      const params = new URLSearchParams();
+      if (searchQuery) {
+        params.append('search', searchQuery);
+      }
+      const response = await fetch(`/api/listings/facets?${params.toString()}`);
+      if (response.ok) {
+        const facets: ListingFacets = await response.json();
+        const counts: Record<string, number> = { ALL: facets.total };
+        facets.categories.forEach((facet) => {
+          counts[facet.value] = facet.count;
+        });
+        setCategoryCounts(counts);
+      }
+    } catch (error) {
+      console.error('Error fetching category counts:', error);
+    }
+  };
+
   const handleCreateListing = () => {
     setIsCreateModalOpen(true);
   };
@@ -210,6 +236,11 @@ export default function HomePage() {
                   `}>
                     {category}
                   </span>
+                  {'ALL' in categoryCounts && (
+                    <span className="font-cyber text-[10px] text-gray-500">
+                      {categoryCounts[category] ?? 0}
+                    </span>
+                  )}
                 </div>
               </button>
             ))}
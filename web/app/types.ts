@@ -23,9 +23,24 @@ export enum Condition {
 }
 
 export enum ListingStatus {
+  PENDING_REVIEW = 'PENDING_REVIEW',
   ACTIVE = 'ACTIVE',
   SOLD = 'SOLD',
   DELETED = 'DELETED',
+  REJECTED = 'REJECTED',
+}
+
+export interface ModerationStatus {
+  id: string;
+  status: ListingStatus;
+  reason?: string | null;
+}
+
+export interface ImageVariants {
+  original: string;
+  thumb: Record<string, string>;
+  card: Record<string, string>;
+  full: Record<string, string>;
 }
 
 export interface Listing {
@@ -40,11 +55,25 @@ export interface Listing {
   location: string;
   seller_name: string;
   images: string[];
+  image_variants?: ImageVariants[];
   views: number;
   created_at: string;
   updated_at: string;
 }
 
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+export interface ListingFacets {
+  total: number;
+  categories: FacetCount[];
+  conditions: FacetCount[];
+  locations: FacetCount[];
+  price: { min: number; max: number | null; count: number }[];
+}
+
 export interface CreateListingData {
   title: string;
   description: string;
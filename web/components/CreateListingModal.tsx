@@ -8,7 +8,27 @@
 import React, { useState } from 'react';
 import CyberButton from './CyberButton';
 import AIListingAssistant from './AIListingAssistant';
-import { Category, Condition, CreateListingData } from '../app/types';
+import { Category, Condition, CreateListingData, Listing, ListingStatus, ModerationStatus } from '../app/types';
+
+// Listings queued for moderation are polled until a verdict arrives
+const MODERATION_POLL_INTERVAL_MS = 1500;
+const MODERATION_POLL_ATTEMPTS = 40;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/** Poll a PENDING_REVIEW listing until it is approved, rejected, or polling gives up */
+async function waitForModeration(listingId: string): Promise<ModerationStatus | null> {
+  for (let attempt = 0; attempt < MODERATION_POLL_ATTEMPTS; attempt++) {
+    await sleep(MODERATION_POLL_INTERVAL_MS);
+    const response = await fetch(`/api/listings/${listingId}/moderation`, { cache: 'no-store' });
+    if (!response.ok) continue;
+    const moderation: ModerationStatus = await response.json();
+    if (moderation.status !== ListingStatus.PENDING_REVIEW) {
+      return moderation;
+    }
+  }
+  return null;
+}
 
 interface CreateListingModalProps {
   onClose: () => void;
@@ -31,6 +51,8 @@ export default function CreateListingModal({ onClose, onSuccess }: CreateListing
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState(false);
+  const [isReviewing, setIsReviewing] = useState(false);
+  const [stillInReview, setStillInReview] = useState(false);
   const [showAIAssistant, setShowAIAssistant] = useState(false);
 
   const handleChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement | HTMLSelectElement>) => {
@@ -94,6 +116,17 @@ export default function CreateListingModal({ onClose, onSuccess }: CreateListing
         throw new Error(errorMessage);
       }
 
+      // Listings queued for moderation are not live until the verdict arrives
+      const listing: Listing = await response.json();
+      if (listing.status === ListingStatus.PENDING_REVIEW) {
+        setIsReviewing(true);
+        const moderation = await waitForModeration(listing.id);
+        if (moderation?.status === ListingStatus.REJECTED) {
+          throw new Error(`Content rejected: ${moderation.reason || 'Contains prohibited content'}`);
+        }
+        setStillInReview(moderation === null);
+      }
+
       // Success
       setSuccess(true);
       setTimeout(() => {
@@ -105,6 +138,7 @@ export default function CreateListingModal({ onClose, onSuccess }: CreateListing
       setError(err.message || 'Something went wrong. Please try again.');
     } finally {
       setIsSubmitting(false);
+      setIsReviewing(false);
     }
   };
 
@@ -161,7 +195,11 @@ export default function CreateListingModal({ onClose, onSuccess }: CreateListing
         {/* Success Message */}
         {success && (
           <div className="mb-6 p-4 bg-cyber-green/20 border border-cyber-green text-cyber-green clip-corner-sm">
-            <p className="font-cyber font-bold">✓ LISTING CREATED SUCCESSFULLY</p>
+            <p className="font-cyber font-bold">
+              {stillInReview
+                ? '✓ LISTING SUBMITTED - STILL UNDER REVIEW, IT WILL APPEAR ONCE APPROVED'
+                : '✓ LISTING CREATED SUCCESSFULLY'}
+            </p>
           </div>
         )}
 
@@ -350,7 +388,7 @@ export default function CreateListingModal({ onClose, onSuccess }: CreateListing
               disabled={isSubmitting}
               fullWidth
             >
-              {isSubmitting ? 'SUBMITTING...' : 'CREATE LISTING'}
+              {isReviewing ? 'UNDER REVIEW...' : isSubmitting ? 'SUBMITTING...' : 'CREATE LISTING'}
             </CyberButton>
             <CyberButton
               type="button"
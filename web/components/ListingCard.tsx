@@ -13,7 +13,11 @@ interface ListingCardProps {
 }
 
 export default function ListingCard({ listing }: ListingCardProps) {
-  const imageUrl = listing.images && listing.images.length > 0
+  // Prefer the server-resized card rendition over the full-size upload
+  const cardVariant = listing.image_variants?.[0]?.card;
+  const imageUrl = cardVariant?.webp
+    ? cardVariant.webp
+    : listing.images && listing.images.length > 0
     ? listing.images[0]
     : 'https://images.unsplash.com/photo-1635070041078-e363dbe005cb?q=80&w=2070&fit=crop';
 